@@ -0,0 +1,262 @@
+# Frame-time and time-to-first-frame benchmarks for retro_countdown.py
+#
+# Drives the countdown scene against the headless MemoryScreen backend, so it
+# runs on any machine with no terminal attached (CI included; Windows skips
+# time to first frame, which needs a pseudo-terminal):
+#   python bench_countdown.py
+#   python bench_countdown.py --frames 500 --sizes 80x24,400x120 --json
+#
+# The curses and ansi backends run in a child process on a pseudo-terminal;
+# bytes/f is then what actually reached the terminal:
+#   python bench_countdown.py --backend ansi --sizes 200x60
+#
+# Time to first frame is measured by launching the CLI itself on a
+# pseudo-terminal and waiting for the countdown digits to arrive, so it covers
+# interpreter start-up, imports, argument parsing and terminal setup.
+
+import argparse
+import json
+import os
+import re
+import shutil
+import signal
+import statistics
+import struct
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+try:
+    import fcntl
+    import pty
+    import termios
+except ImportError:  # Windows: the in-memory backend only, with no time to first frame
+    pty = None
+
+import retro_countdown as rc
+
+DEFAULT_SIZES = "80x24,200x60,400x120"
+TIMER_DIGITS = re.compile(rb"\d\d:\d\d:\d\d")
+
+# Particle intensity follows the time remaining on the countdown
+INTENSITIES = {
+    "calm": timedelta(hours=10),  # 1 spark per spawn
+    "busy": timedelta(minutes=20),  # Mixed sparks and glitches
+    "urgent": timedelta(minutes=3),  # 5-6 urgent glitches per spawn
+}
+
+
+def parse_sizes(text):
+    sizes = []
+    for item in text.split(","):
+        width, height = item.lower().split("x")
+        sizes.append((int(width), int(height)))
+    return sizes
+
+
+def run_case(screen, remaining, frames, fps, trail_length, glyph_groups, theme, timers=1, seed=None,
+             record=False):
+    """Render frames of one scenario on a screen and collect per-frame measurements
+
+    With record, the frames are also written to a throwaway session recording.
+    """
+    height, width = screen.size()
+    # Dashboard timers are staggered a minute apart around the intensity's remaining time
+    clocks = [rc.CountdownClock(datetime.now() + remaining + timedelta(minutes=i)) for i in range(timers)]
+
+    # Like the CLI: the first frame is drawn with Tier 1 glyphs, then the
+    # probed groups are swapped in
+    scene = rc.MatrixCountdown(screen, clocks, theme, rc.basic_glyph_groups(), trail_length=trail_length,
+                               seed=seed)
+    start = time.monotonic()
+    scene.render_frame(start)
+    scene.set_glyph_groups(glyph_groups)
+    recorder = None
+    if record:
+        with tempfile.NamedTemporaryFile(suffix=".rec", delete=False) as handle:
+            record_path = handle.name
+        recorder = rc.SessionRecorder(record_path, "matrix")
+        recorder.start(height, width)
+        scene.frame_buffer.recorder = recorder
+
+    # Simulated frame timestamps keep spawn and blink timing realistic while
+    # the frames themselves run back to back
+    frame_times = []
+    calls = []
+    written = []
+    particles = 0
+    frame_buffer = scene.frame_buffer
+    for i in range(1, frames + 1):
+        t0 = time.perf_counter()
+        scene.render_frame(start + i / fps)
+        frame_times.append(time.perf_counter() - t0)
+        # Counted by the frame buffer so every backend reports the same way
+        calls.append(frame_buffer.frame_addstr_calls)
+        written.append(frame_buffer.frame_bytes)
+        particles = max(particles, scene.particles.count)
+
+    if recorder is not None:
+        recorder.close()
+        os.unlink(record_path)
+
+    ordered = sorted(frame_times)
+    result = {
+        "size": f"{width}x{height}",
+        "frames": frames,
+        "fps": frames / sum(frame_times),
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000,
+        "addstr_per_frame": statistics.mean(calls),
+        "bytes_per_frame": statistics.mean(written),
+        "peak_particles": particles,
+    }
+    if recorder is not None:
+        result["record_bytes_per_frame"] = recorder.bytes_written / frames
+    return result
+
+
+def run_in_pty(backend, width, height, *case_args):
+    """Run one case against a real terminal backend in a child on a pseudo-terminal
+
+    The parent drains the terminal side, so bytes_per_frame becomes the number
+    of bytes that actually reached it rather than an estimate.
+    """
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as handle:
+        result_path = handle.name
+    pid, master = pty.fork()
+    if pid == 0:
+        try:
+            fcntl.ioctl(0, termios.TIOCSWINSZ, struct.pack("HHHH", height, width, 0, 0))
+            os.environ["TERM"] = os.environ.get("BENCH_TERM", "xterm-256color")
+
+            def body(stdscr):
+                screen = stdscr if backend == "ansi" else rc.CursesScreen(stdscr)
+                return run_case(screen, *case_args)
+
+            wrapper = rc.ansi_wrapper if backend == "ansi" else rc.curses.wrapper
+            result = wrapper(body)
+        except Exception as exc:
+            result = {"error": f"{type(exc).__name__}: {exc}"}
+        with open(result_path, "w") as handle:
+            json.dump(result, handle)
+        os._exit(0)
+
+    total = 0
+    while True:
+        try:
+            data = os.read(master, 65536)
+        except OSError:  # EIO once the child side closes
+            break
+        if not data:
+            break
+        total += len(data)
+    os.waitpid(pid, 0)
+    os.close(master)
+    with open(result_path) as handle:
+        result = json.load(handle)
+    os.unlink(result_path)
+    if "error" in result:
+        raise RuntimeError(f"{backend} backend failed: {result['error']}")
+    result["bytes_per_frame"] = total / (result["frames"] + 1)
+    return result
+
+
+def launch_ttff(backend, width, height, theme_name):
+    """Milliseconds from launching the CLI on a pseudo-terminal until its first frame arrives
+
+    The child gets a throwaway glyph cache, so the run leaves the user's alone;
+    glyphs are only probed after the first frame either way.
+    """
+    argv = [sys.executable, os.path.abspath(rc.__file__), "+1h", theme_name, "--no-banner"]
+    if backend == "ansi":
+        argv += ["--backend", "ansi"]
+    cache_dir = tempfile.mkdtemp()
+    start = time.perf_counter()
+    pid, master = pty.fork()
+    if pid == 0:
+        fcntl.ioctl(0, termios.TIOCSWINSZ, struct.pack("HHHH", height, width, 0, 0))
+        os.environ["TERM"] = os.environ.get("BENCH_TERM", "xterm-256color")
+        os.environ["XDG_CACHE_HOME"] = cache_dir
+        os.execv(sys.executable, argv)
+
+    output = b""
+    ttff = None
+    while ttff is None and time.perf_counter() - start < 10:
+        try:
+            data = os.read(master, 65536)
+        except OSError:  # EIO: the child exited before drawing
+            break
+        if not data:
+            break
+        output += data
+        if TIMER_DIGITS.search(output):
+            ttff = time.perf_counter() - start
+    os.kill(pid, signal.SIGTERM)
+    try:
+        while os.read(master, 65536):
+            pass
+    except OSError:
+        pass
+    os.waitpid(pid, 0)
+    os.close(master)
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    if ttff is None:
+        raise RuntimeError(f"no frame from {' '.join(argv[1:])}: {output[-200:]!r}")
+    return ttff * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the countdown renderer headlessly")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--fps", type=float, default=20, help="simulated frame rate for animation timing")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated WIDTHxHEIGHT list")
+    parser.add_argument("--intensities", default=",".join(INTENSITIES),
+                        help="comma-separated subset of: " + ", ".join(INTENSITIES))
+    parser.add_argument("--trail", type=int, default=1)
+    parser.add_argument("--timers", type=int, default=1, help="countdowns per screen (dashboard mode above 1)")
+    parser.add_argument("--seed", type=int, default=0, help="effects RNG seed, so runs are comparable")
+    parser.add_argument("--backend", choices=("memory", "ansi", "curses"), default="memory",
+                        help="screen to render to; ansi and curses run on a pseudo-terminal")
+    parser.add_argument("--theme", default="matrix", choices=sorted(rc.get_color_themes()))
+    parser.add_argument("--colors", type=int, default=256, help="colors the in-memory screen claims to show")
+    parser.add_argument("--record", action="store_true", help="also record each case, to measure the overhead")
+    parser.add_argument("--launches", type=int, default=3,
+                        help="CLI launches per size for time to first frame (median is reported, 0 skips)")
+    parser.add_argument("--json", action="store_true", help="emit one JSON object per case")
+    args = parser.parse_args()
+    if pty is None and args.backend != "memory":
+        parser.error(f"--backend {args.backend} needs a pseudo-terminal, which this platform lacks")
+
+    theme = rc.get_color_themes()[args.theme]
+    glyph_groups = rc.probe_glyph_groups(None)
+
+    if not args.json:
+        print(f"{'size':>8} {'intensity':>9} {'fps':>9} {'p50 ms':>8} {'p99 ms':>8} "
+              f"{'addstr/f':>9} {'bytes/f':>9} {'particles':>9} {'ttff ms':>8}")
+    for width, height in parse_sizes(args.sizes):
+        # Start-up does not depend on the particle intensity, so it is timed once per size
+        launches = [launch_ttff(args.backend, width, height, args.theme)
+                    for _ in range(args.launches if pty is not None else 0)]
+        ttff = statistics.median(launches) if launches else float("nan")
+        for name in args.intensities.split(","):
+            case_args = (INTENSITIES[name], args.frames, args.fps, args.trail, glyph_groups, theme,
+                         args.timers, args.seed, args.record)
+            if args.backend == "memory":
+                result = run_case(rc.MemoryScreen(height, width, args.colors), *case_args)
+            else:
+                result = run_in_pty(args.backend, width, height, *case_args)
+            result["backend"] = args.backend
+            result["intensity"] = name
+            result["ttff_ms"] = ttff
+            if args.json:
+                print(json.dumps(result))
+            else:
+                print(f"{result['size']:>8} {name:>9} {result['fps']:>9.1f} {result['p50_ms']:>8.3f} "
+                      f"{result['p99_ms']:>8.3f} {result['addstr_per_frame']:>9.1f} "
+                      f"{result['bytes_per_frame']:>9.1f} {result['peak_particles']:>9} {result['ttff_ms']:>8.2f}")
+            sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,29 +2,97 @@
 #   pip install wcwidth
 # On Windows also: pip install windows-curses
 
-import curses
+import argparse
+import heapq
+import importlib
+import importlib.util
+import json
+import locale
+import math
+import os
+import re
+import select
+import shutil
+import signal
 import time
 import random
+import threading
+from array import array
+from collections import deque
 import sys
 from datetime import datetime, timedelta
 
+
+class LazyModule:
+    """Stand-in for a module that is only imported on first attribute access
+
+    Keeps --help, argument errors and the banner from paying for curses, wcwidth
+    and NumPy. Attributes are cached on the proxy once the module is loaded.
+    """
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        value = getattr(importlib.import_module(self._name), attr)
+        setattr(self, attr, value)
+        return value
+
+
+def lazy_import(name):
+    """LazyModule for name, or None when the module is not installed"""
+    try:
+        if importlib.util.find_spec(name) is None:
+            return None
+    except (ImportError, ValueError):
+        return None
+    return LazyModule(name)
+
+
+curses = LazyModule("curses")
+
 # Handle wide glyphs correctly with better fallback
-try:
-    from wcwidth import wcswidth
+wcwidth = lazy_import("wcwidth")
+
+
+def safe_wcswidth(s):
+    if not s:
+        return 0
+    if wcwidth is None:
+        return len(s)
+    w = wcwidth.wcswidth(s)
+    # Handle None return (control characters, etc.)
+    if w is None:
+        return len(s)
+    # Handle negative return (some terminals report this for certain chars)
+    return max(0, w)
 
 
-    def safe_wcswidth(s):
-        if not s:
-            return 0
-        w = wcswidth(s)
-        # Handle None return (control characters, etc.)
-        if w is None:
-            return len(s)
-        # Handle negative return (some terminals report this for certain chars)
-        return max(0, w)
-except ImportError:
-    def safe_wcswidth(s):
-        return len(s) if s else 0
+def wcwidth_version():
+    if wcwidth is None:
+        return None
+    return getattr(wcwidth, "__version__", "unknown")
+
+
+# NumPy is optional; it only speeds up the simulation on very wide terminals
+np = lazy_import("numpy")
+
+# Terminal modes for the ANSI backend (Unix only)
+termios = lazy_import("termios")
+tty = lazy_import("tty")
+
+# Only the countdown daemon and its clients need asyncio
+asyncio = LazyModule("asyncio")
+
+# curses color numbers, so themes can be defined without importing curses
+COLOR_BLACK = 0
+COLOR_RED = 1
+COLOR_GREEN = 2
+COLOR_YELLOW = 3
+COLOR_BLUE = 4
+COLOR_MAGENTA = 5
+COLOR_CYAN = 6
+COLOR_WHITE = 7
 
 
 def is_safe_unicode(char):
@@ -47,188 +115,337 @@ def is_safe_unicode(char):
         return False
 
 
-def test_symbol_safely(stdscr, symbol):
-    """Test if a symbol can be safely displayed in the current terminal"""
-    try:
-        # Test if character exists and has valid width
-        width = safe_wcswidth(symbol)
-        if width is None or width <= 0:
-            return False
+def probe_glyphs(stdscr, glyphs):
+    """Probe a whole batch of glyphs at once, returning those the terminal accepts
 
-        # Try to actually write it (this is the real test)
-        height, term_width = stdscr.getmaxyx()
-        test_y, test_x = height - 1, 0
+    Acceptance is decided in bulk from wcwidth and the screen's encoder, then
+    confirmed by writing the survivors into an off-screen pad. Nothing is ever
+    refreshed, so probing costs no terminal round-trips and causes no flicker.
+    With no window (headless backends) the bulk checks alone decide.
+    """
+    encoding = getattr(stdscr, "encoding", None) or locale.getpreferredencoding(False)
+    if stdscr is None:
+        encoding = "utf-8"  # Headless backends store text, not terminal bytes
 
-        # Save what's currently there
+    candidates = []
+    for glyph in glyphs:
+        width = safe_wcswidth(glyph)
+        if width is None or width <= 0:
+            continue
         try:
-            old_char = stdscr.inch(test_y, test_x)
-        except curses.error:
-            old_char = ord(' ')
+            glyph.encode(encoding)
+        except (UnicodeEncodeError, LookupError):
+            continue
+        candidates.append((glyph, width))
+
+    if not candidates:
+        return []
+    if stdscr is None:
+        return [glyph for glyph, _ in candidates]
+
+    # Lay the batch out side by side, leaving slack so the last write never
+    # has to advance the cursor past the pad edge
+    pad_width = sum(width for _, width in candidates) + 2
+    try:
+        pad = curses.newpad(1, pad_width)
+    except curses.error:
+        return [glyph for glyph, _ in candidates]
 
-        # Test write the symbol
-        stdscr.addstr(test_y, test_x, symbol)
-        stdscr.refresh()
+    accepted = []
+    x = 0
+    for glyph, width in candidates:
+        try:
+            pad.addstr(0, x, glyph)
+            accepted.append(glyph)
+        except (curses.error, UnicodeEncodeError, UnicodeDecodeError, ValueError):
+            pass
+        x += width
+    return accepted
+
+
+# Tier 1: Basic ASCII (always works)
+TIER1_SAFE = [
+    "|", ":", ";", ".", ",", "'", "\"", "`", "~",
+    "!", "@", "#", "$", "%", "^", "&", "*", "(", ")",
+    "-", "_", "+", "=", "[", "]", "{", "}", "\\", "/",
+    "0", "1", "2", "3", "4", "5", "6", "7", "8", "9",
+    "A", "B", "C", "D", "E", "F", "G", "H", "I", "J",
+    "K", "L", "M", "N", "O", "P", "Q", "R", "S", "T",
+    "U", "V", "W", "X", "Y", "Z", "a", "b", "c", "d"
+]
+
+# Tier 2: Basic Unicode (widely supported)
+TIER2_SYMBOLS = [
+    "│", "┃", "║", "─", "━", "═", "┌", "┐", "└", "┘",
+    "┬", "┴", "├", "┤", "┼", "╔", "╗", "╚", "╝",
+    "•", "○", "●", "◦", "▪", "▫", "■", "□", "▲", "▼",
+    "◄", "►", "♦", "♠", "♣", "♥", "☆", "★",
+    "↑", "↓", "→", "←", "↔", "↕", "⟲", "⟳"
+]
+
+# Tier 3: Matrix-style symbols
+TIER3_SYMBOLS = [
+    # Braille patterns (the classic Matrix look)
+    "⠀", "⠁", "⠂", "⠃", "⠄", "⠅", "⠆", "⠇",
+    "⣀", "⣁", "⣂", "⣃", "⣄", "⣅", "⣆", "⣇",
+    "⣿", "⣾", "⣽", "⣼", "⣻", "⣺", "⣹", "⣸",
+    "⣷", "⣶", "⣵", "⣴", "⣳", "⣲", "⣱", "⣰",
+    "⣯", "⣮", "⣭", "⣬", "⣫", "⣪", "⣩", "⣨",
+    "⣟", "⣞", "⣝", "⣜", "⣛", "⣚", "⣙", "⣘",
+    "⡿", "⡾", "⡽", "⡼", "⡻", "⡺", "⡹", "⡸",
+    # Block elements
+    "▁", "▂", "▃", "▄", "▅", "▆", "▇", "█",
+    "▉", "▊", "▋", "▌", "▍", "▎", "▏",
+    "▐", "░", "▒", "▓", "▔", "▕",
+    # Geometric shapes
+    "◆", "◇", "◈", "◉", "◊", "○", "◌", "◍", "◎", "●",
+    "◐", "◑", "◒", "◓", "◔", "◕", "◖", "◗",
+    "⬟", "⬢", "⬡", "⬠", "⬣", "⬤", "⬥", "⬦",
+    # Stars and sparkles
+    "✦", "✧", "✩", "✪", "✫", "✬", "✭", "✮",
+    "✯", "✰", "✱", "✲", "✳", "✴", "✵", "✶",
+    "✷", "✸", "✹", "✺", "✻", "✼", "✽", "✾", "✿",
+    "❀", "❁", "❂", "❃", "❄", "❅", "❆", "❇", "❈",
+    # Technical/sci-fi symbols
+    "≡", "≣", "≢", "≡", "≠", "≤", "≥", "≈", "≅",
+    "⊗", "⊙", "⊚", "⊛", "⊜", "⊝", "⊞", "⊟",
+    "⊠", "⊡", "⊢", "⊣", "⊤", "⊥", "⊦", "⊧",
+    "⟇", "⟑", "⟒", "⟓", "⟔", "⟕", "⟖", "⟗",
+    # Arrows (more variety)
+    "↖", "↗", "↘", "↙", "↚", "↛", "↜", "↝",
+    "⇐", "⇓", "⇑", "⇒", "⇔", "⇕", "⇖", "⇗",
+    "⇘", "⇙", "⇚", "⇛", "⇜", "⇝"
+]
+
+# Tier 4: Extended Unicode ranges
+TIER4_SYMBOLS = (
+    [chr(code) for code in range(0x2580, 0x259F)] +  # More block elements
+    [chr(code) for code in range(0x25A0, 0x25FF)] +  # More geometric shapes
+    [chr(code) for code in range(0x2200, 0x2230)] +  # Mathematical operators
+    [chr(code) for code in range(0x2600, 0x2670)]    # Miscellaneous symbols
+)
+
+# Tier 5: Even more exotic (if terminal is really good)
+TIER5_SYMBOLS = [
+    # Currency and misc
+    "₿", "€", "£", "¥", "₹", "₽", "₩", "₪",
+    # Zodiac
+    "♈", "♉", "♊", "♋", "♌", "♍", "♎", "♏",
+    "♐", "♑", "♒", "♓",
+    # Chess pieces
+    "♔", "♕", "♖", "♗", "♘", "♙", "♚", "♛",
+    "♜", "♝", "♞", "♟",
+    # Weather
+    "☀", "☁", "☂", "☃", "☄", "★", "☆", "☇",
+    "☈", "☉", "☊", "☋", "☌", "☍", "☎", "☔"
+]
+
+SYMBOL_TIERS = ["tier1", "tier2", "tier3", "tier4", "tier5"]
+
+# Special-purpose glyphs probed alongside the rain tiers
+HOURGLASS_FRAMES = ["⏳", "⌛"]
+BLOCK_CURSOR = "█"
+SPARK_SYMBOLS = ["*", ".", "·", "°", "˚", "•", "◦", "○", "◯"]
+GLITCH_SYMBOLS = ["#", "@", "&", "%", "?", "!", "~", "^", "¿", "¡"]
+
+PROBE_CACHE_VERSION = 1
+
+
+def probe_glyph_groups(stdscr):
+    """Probe every symbol tier and special glyph group in the current terminal"""
+    # Start with Tier 1 (always works)
+    groups = {"tier1": TIER1_SAFE[:]}
+    working_count = len(TIER1_SAFE)
 
-        # Restore original character
-        stdscr.addch(test_y, test_x, old_char)
-        stdscr.refresh()
+    # Test and add each tier as a single batch
+    groups["tier2"] = probe_glyphs(stdscr, TIER2_SYMBOLS)
+    groups["tier3"] = probe_glyphs(stdscr, TIER3_SYMBOLS)
+    working_count += len(groups["tier2"]) + len(groups["tier3"])
 
-        return True
+    groups["tier4"] = []
+    if working_count > 50:  # Only if we have good base
+        groups["tier4"] = probe_glyphs(stdscr, TIER4_SYMBOLS)
+        working_count += len(groups["tier4"])
 
-    except (curses.error, UnicodeEncodeError, UnicodeDecodeError, ValueError):
-        return False
+    # Test Tier 5 if terminal is really capable
+    groups["tier5"] = []
+    if working_count > 100:  # Only for very capable terminals
+        groups["tier5"] = probe_glyphs(stdscr, TIER5_SYMBOLS)
 
+    groups["spinner"] = probe_glyphs(stdscr, HOURGLASS_FRAMES)
+    groups["cursor"] = probe_glyphs(stdscr, [BLOCK_CURSOR])
+    groups["sparks"] = probe_glyphs(stdscr, SPARK_SYMBOLS)
+    groups["glitches"] = probe_glyphs(stdscr, GLITCH_SYMBOLS)
+    return groups
 
-def get_safe_symbols(stdscr):
-    """Get symbols that work in the current terminal, with comprehensive fallback"""
 
+def basic_glyph_groups():
+    """Glyph groups that need no probing: Tier 1 rain symbols only
 
-def get_safe_symbols(stdscr):
+    The spinner, cursor and particles then use their ASCII fallbacks.
+    """
+    return {"tier1": TIER1_SAFE[:]}
+
+
+def get_safe_symbols(stdscr, groups=None):
     """Get symbols that work in the current terminal, with comprehensive fallback"""
+    if groups is None:
+        groups = probe_glyph_groups(stdscr)
 
-    # Tier 1: Basic ASCII (always works)
-    tier1_safe = [
-        "|", ":", ";", ".", ",", "'", "\"", "`", "~",
-        "!", "@", "#", "$", "%", "^", "&", "*", "(", ")",
-        "-", "_", "+", "=", "[", "]", "{", "}", "\\", "/",
-        "0", "1", "2", "3", "4", "5", "6", "7", "8", "9",
-        "A", "B", "C", "D", "E", "F", "G", "H", "I", "J",
-        "K", "L", "M", "N", "O", "P", "Q", "R", "S", "T",
-        "U", "V", "W", "X", "Y", "Z", "a", "b", "c", "d"
-    ]
-
-    # Tier 2: Basic Unicode (widely supported)
-    tier2_symbols = [
-        "│", "┃", "║", "─", "━", "═", "┌", "┐", "└", "┘",
-        "┬", "┴", "├", "┤", "┼", "╔", "╗", "╚", "╝",
-        "•", "○", "●", "◦", "▪", "▫", "■", "□", "▲", "▼",
-        "◄", "►", "♦", "♠", "♣", "♥", "☆", "★",
-        "↑", "↓", "→", "←", "↔", "↕", "⟲", "⟳"
-    ]
-
-    # Tier 3: Matrix-style symbols
-    tier3_symbols = [
-        # Braille patterns (the classic Matrix look)
-        "⠀", "⠁", "⠂", "⠃", "⠄", "⠅", "⠆", "⠇",
-        "⣀", "⣁", "⣂", "⣃", "⣄", "⣅", "⣆", "⣇",
-        "⣿", "⣾", "⣽", "⣼", "⣻", "⣺", "⣹", "⣸",
-        "⣷", "⣶", "⣵", "⣴", "⣳", "⣲", "⣱", "⣰",
-        "⣯", "⣮", "⣭", "⣬", "⣫", "⣪", "⣩", "⣨",
-        "⣟", "⣞", "⣝", "⣜", "⣛", "⣚", "⣙", "⣘",
-        "⡿", "⡾", "⡽", "⡼", "⡻", "⡺", "⡹", "⡸",
-        # Block elements
-        "▁", "▂", "▃", "▄", "▅", "▆", "▇", "█",
-        "▉", "▊", "▋", "▌", "▍", "▎", "▏",
-        "▐", "░", "▒", "▓", "▔", "▕",
-        # Geometric shapes
-        "◆", "◇", "◈", "◉", "◊", "○", "◌", "◍", "◎", "●",
-        "◐", "◑", "◒", "◓", "◔", "◕", "◖", "◗",
-        "⬟", "⬢", "⬡", "⬠", "⬣", "⬤", "⬥", "⬦",
-        # Stars and sparkles
-        "✦", "✧", "✩", "✪", "✫", "✬", "✭", "✮",
-        "✯", "✰", "✱", "✲", "✳", "✴", "✵", "✶",
-        "✷", "✸", "✹", "✺", "✻", "✼", "✽", "✾", "✿",
-        "❀", "❁", "❂", "❃", "❄", "❅", "❆", "❇", "❈",
-        # Technical/sci-fi symbols
-        "≡", "≣", "≢", "≡", "≠", "≤", "≥", "≈", "≅",
-        "⊗", "⊙", "⊚", "⊛", "⊜", "⊝", "⊞", "⊟",
-        "⊠", "⊡", "⊢", "⊣", "⊤", "⊥", "⊦", "⊧",
-        "⟇", "⟑", "⟒", "⟓", "⟔", "⟕", "⟖", "⟗",
-        # Arrows (more variety)
-        "↖", "↗", "↘", "↙", "↚", "↛", "↜", "↝",
-        "⇐", "⇓", "⇑", "⇒", "⇔", "⇕", "⇖", "⇗",
-        "⇘", "⇙", "⇚", "⇛", "⇜", "⇝"
-    ]
-
-    # Tier 4: Extended Unicode ranges
-    tier4_symbols = []
-    # More block elements
-    for code in range(0x2580, 0x259F):
-        tier4_symbols.append(chr(code))
-    # More geometric shapes
-    for code in range(0x25A0, 0x25FF):
-        tier4_symbols.append(chr(code))
-    # Mathematical operators
-    for code in range(0x2200, 0x2230):
-        tier4_symbols.append(chr(code))
-    # Miscellaneous symbols
-    for code in range(0x2600, 0x2670):
-        tier4_symbols.append(chr(code))
-
-    # Tier 5: Even more exotic (if terminal is really good)
-    tier5_symbols = [
-        # Currency and misc
-        "₿", "€", "£", "¥", "₹", "₽", "₩", "₪",
-        # Zodiac
-        "♈", "♉", "♊", "♋", "♌", "♍", "♎", "♏",
-        "♐", "♑", "♒", "♓",
-        # Chess pieces
-        "♔", "♕", "♖", "♗", "♘", "♙", "♚", "♛",
-        "♜", "♝", "♞", "♟",
-        # Weather
-        "☀", "☁", "☂", "☃", "☄", "★", "☆", "☇",
-        "☈", "☉", "☊", "☋", "☌", "☍", "☎", "☔"
-    ]
+    working_symbols = []
+    for tier in SYMBOL_TIERS:
+        working_symbols.extend(groups.get(tier, []))
+    return working_symbols
 
-    # Start with Tier 1 (always works)
-    working_symbols = tier1_safe[:]
 
-    # Test and add each tier
-    for symbol in tier2_symbols:
-        if test_symbol_safely(stdscr, symbol):
-            working_symbols.append(symbol)
+def terminal_size_class(height, width):
+    """Bucket a terminal size so small resizes don't invalidate the probe cache"""
+    if width < 80 or height < 24:
+        return "small"
+    if width < 200:
+        return "medium"
+    return "large"
 
-    for symbol in tier3_symbols:
-        if test_symbol_safely(stdscr, symbol):
-            working_symbols.append(symbol)
 
-    # Test Tier 4 in smaller batches for performance
-    if len(working_symbols) > 50:  # Only if we have good base
-        for symbol in tier4_symbols[::2]:  # Test every other symbol
-            if test_symbol_safely(stdscr, symbol):
-                working_symbols.append(symbol)
+def probe_cache_key(height, width):
+    """Build the cache key for the current terminal environment"""
+    term = os.environ.get("TERM", "unknown")
+    try:
+        ctype = locale.setlocale(locale.LC_CTYPE)
+    except locale.Error:
+        ctype = "C"
+    encoding = locale.getpreferredencoding(False)
+    return "|".join([term, f"{ctype}/{encoding}", terminal_size_class(height, width),
+                     wcwidth_version() or "none"])
 
-    # Test Tier 5 if terminal is really capable
-    if len(working_symbols) > 100:  # Only for very capable terminals
-        for symbol in tier5_symbols:
-            if test_symbol_safely(stdscr, symbol):
-                working_symbols.append(symbol)
 
-    return working_symbols
+def probe_cache_path():
+    """Location of the glyph probe cache, following the XDG base directory spec"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "retro_countdown", "glyph-probe.json")
 
 
-def countdown_matrix(stdscr, target):
-    curses.curs_set(0)
+class GlyphProbeCache:
+    """On-disk cache of glyph probe results, one entry per terminal environment"""
 
-    # Initialize colors safely
-    if curses.has_colors():
-        curses.start_color()
-        curses.init_pair(1, curses.COLOR_GREEN, curses.COLOR_BLACK)
-        color_pair = curses.color_pair(1) | curses.A_BOLD
-    else:
-        color_pair = curses.A_BOLD
+    def __init__(self, path=None):
+        self.path = path or probe_cache_path()
+        self._entries = None
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") != PROBE_CACHE_VERSION:
+                    raise ValueError("Stale probe cache version")
+                self._entries = data.get("entries", {})
+            except (OSError, ValueError, AttributeError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, key):
+        """Return the cached glyph groups for key, or None on a miss"""
+        entry = self._load().get(key)
+        if not isinstance(entry, dict) or not isinstance(entry.get("groups"), dict):
+            return None
+        return entry["groups"]
+
+    def put(self, key, groups, probe_ms=None):
+        """Store glyph groups for key and write the cache back to disk"""
+        self._load()[key] = {"groups": groups, "probed_at": time.time(), "probe_ms": probe_ms}
+        self._save()
+
+    def invalidate(self, key=None):
+        """Drop one cached entry, or the whole cache when no key is given"""
+        if key is None:
+            self._entries = {}
+        else:
+            self._load().pop(key, None)
+        self._save()
+
+    def keys(self):
+        return list(self._load().keys())
 
-    # Initialize matrix state
+    def _save(self):
+        # Write atomically so concurrent launches never see a torn file
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": PROBE_CACHE_VERSION, "entries": self._entries}, f,
+                          ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass  # A read-only cache dir just means we probe every launch
+
+
+def load_glyph_groups(stdscr, reprobe=False, cache=None):
+    """Get probed glyph groups from the cache, probing the terminal on a miss"""
+    cache = cache or GlyphProbeCache()
     height, width = stdscr.getmaxyx()
-    cols = list(range(0, max(2, width - 1), 2))  # Stay within bounds
-    drops = [random.randint(-height, height) for _ in cols]
+    key = probe_cache_key(height, width)
+
+    if reprobe:
+        cache.invalidate(key)
+    else:
+        groups = cache.get(key)
+        if groups is not None:
+            return groups
+
+    probe_start = time.perf_counter()
+    groups = probe_glyph_groups(stdscr)
+    cache.put(key, groups, probe_ms=(time.perf_counter() - probe_start) * 1000)
+    return groups
+
 
+def get_cached_symbol_tiers(height=None, width=None, cache=None):
+    """Return {tier: symbols} cached for this environment without touching the terminal"""
+    if height is None or width is None:
+        size = shutil.get_terminal_size()
+        height, width = size.lines, size.columns
+    groups = (cache or GlyphProbeCache()).get(probe_cache_key(height, width))
+    if groups is None:
+        return None
+    return {tier: list(groups.get(tier, [])) for tier in SYMBOL_TIERS}
 
-def test_and_measure_chars(stdscr):
+
+class SymbolTable:
+    """Rain symbols compiled once into parallel glyph and display-width arrays
+
+    The hot loop only does index lookups: pick an index, read the glyph and its
+    precomputed width, and fall back to the narrow-only subset at the screen edge.
+    """
+
+    def __init__(self, symbols):
+        self.glyphs = []
+        self.widths = []
+        for ch in symbols:
+            ch_width = safe_wcswidth(ch)
+            if ch_width > 0:
+                self.glyphs.append(ch)
+                self.widths.append(ch_width)
+        if not self.glyphs:  # Ultimate fallback
+            self.glyphs, self.widths = ["|"], [1]
+
+        self.narrow = [ch for ch, ch_width in zip(self.glyphs, self.widths) if ch_width == 1] or ["|"]
+
+
+def test_and_measure_chars(stdscr, groups=None):
     """Test spinner and cursor chars, return working versions with measured widths"""
+    if groups is None:
+        groups = probe_glyph_groups(stdscr)
 
     # Test hourglass spinner
-    hourglass_frames = ["⏳", "⌛"]
     safe_frames = []
     frame_width = 1
 
-    for frame in hourglass_frames:
-        if test_symbol_safely(stdscr, frame):
-            # Measure actual display width
-            measured_width = safe_wcswidth(frame)
-            if measured_width and measured_width > 0:
-                safe_frames.append(frame)
-                frame_width = max(frame_width, measured_width)
+    for frame in groups.get("spinner", []):
+        # Measure actual display width
+        measured_width = safe_wcswidth(frame)
+        if measured_width and measured_width > 0:
+            safe_frames.append(frame)
+            frame_width = max(frame_width, measured_width)
 
     # Fallback if hourglass doesn't work
     if not safe_frames:
@@ -236,9 +453,9 @@ def test_and_measure_chars(stdscr):
         frame_width = 1
 
     # Test block cursor
-    block_cursor = "█"
+    block_cursor = BLOCK_CURSOR
     cursor_width = 1
-    if test_symbol_safely(stdscr, block_cursor):
+    if block_cursor in groups.get("cursor", []):
         cursor_width = safe_wcswidth(block_cursor) or 1
     else:
         block_cursor = "#"
@@ -247,353 +464,2888 @@ def test_and_measure_chars(stdscr):
     return safe_frames, frame_width, block_cursor, cursor_width
 
 
-class Particle:
-    """Represents a single spark/glitch particle"""
-
-    def __init__(self, x, y, symbol, lifetime, dx=0, dy=0, color_variant=0):
-        self.x = x
-        self.y = y
-        self.symbol = symbol
-        self.lifetime = lifetime
-        self.max_lifetime = lifetime
-        self.dx = dx  # movement in x direction
-        self.dy = dy  # movement in y direction
-        self.color_variant = color_variant
-
-    def update(self):
-        """Update particle position and lifetime"""
-        self.x += self.dx
-        self.y += self.dy
-        self.lifetime -= 1
-        return self.lifetime > 0
-
-    def get_alpha(self):
-        """Get alpha value based on remaining lifetime (0.0 to 1.0)"""
-        return self.lifetime / self.max_lifetime if self.max_lifetime > 0 else 0
-
-
-def countdown_matrix(stdscr, target, theme):
-    curses.curs_set(0)
-
-    # Initialize colors based on selected theme
-    if curses.has_colors():
-        curses.start_color()
-        curses.init_pair(1, theme.primary, theme.background)  # Main countdown
-        curses.init_pair(2, theme.secondary, theme.background)  # Matrix rain
-        curses.init_pair(3, theme.accent1, theme.background)  # Spark color 1
-        curses.init_pair(4, theme.accent2, theme.background)  # Spark color 2
-        curses.init_pair(5, theme.urgent, theme.background)  # Urgent/glitch color
-        curses.init_pair(6, theme.accent1, theme.background)  # Extra accent
-
-        color_pair = curses.color_pair(1) | curses.A_BOLD  # Main countdown
-        matrix_color = curses.color_pair(2) | curses.A_BOLD  # Matrix rain
-        spark_colors = [
-            curses.color_pair(3) | curses.A_BOLD,  # Accent 1
-            curses.color_pair(4) | curses.A_BOLD,  # Accent 2
-            curses.color_pair(5) | curses.A_BOLD,  # Urgent
-            curses.color_pair(6) | curses.A_BOLD,  # Extra accent
-        ]
-    else:
-        color_pair = curses.A_BOLD
-        matrix_color = curses.A_BOLD
-        spark_colors = [curses.A_BOLD, curses.A_REVERSE, curses.A_UNDERLINE]
-
-    # Test and measure characters once at startup
-    spinner_frames, frame_width, block_cursor, cursor_width = test_and_measure_chars(stdscr)
+# Rough bytes of cursor-movement and attribute escapes a terminal backend sends
+# around each cell, used when estimating output bandwidth
+ESCAPE_BYTES = 8
+
+# Style indices into the FrameBuffer attribute table
+STYLE_DEFAULT = 0
+STYLE_TIMER = 1
+STYLE_RAIN = 2
+STYLE_RAIN_HEAD = 3
+STYLE_RAIN_FADE = 4
+STYLE_SPARK = 5  # Spark color variants follow from here
+SPARK_STYLES = 4
+SPARK_ROLES = ("accent1", "accent2", "urgent", "accent1")  # Theme color of each spark variant
+
+# Fade gradients follow the spark variants: ALPHA_BUCKETS steps of remaining
+# lifetime for each spark variant, then RAIN_SHADES shades for rain trails.
+# On terminals without 256 colors they hold copies of the styles above.
+ALPHA_BUCKETS = 10
+RAIN_SHADES = 6
+STYLE_SPARK_FADE = STYLE_SPARK + SPARK_STYLES
+STYLE_RAIN_SHADE = STYLE_SPARK_FADE + SPARK_STYLES * ALPHA_BUCKETS
+STYLE_COUNT = STYLE_RAIN_SHADE + RAIN_SHADES
+
+
+def blend(base, color, alpha):
+    """Mix two RGB colors; alpha 1 gives color, 0 gives base"""
+    return tuple(round(b + (c - b) * alpha) for b, c in zip(base, color))
+
+
+def gradient_specs(theme):
+    """(rgb, fallback style) for each fade-gradient style, in style order
+
+    Particles fade from their spark color toward the background, rain shades
+    from the rain color down to a quarter of it. The fallback is the 8-color
+    style each one degrades to, which gives the classic look: particles take
+    the rain color for the last 30% of their life, trails the dim rain style
+    for their last third. rgb is None for themes without RGB colors.
+    """
+    rgb = theme.rgb
+    specs = []
+    for variant, role in enumerate(SPARK_ROLES):
+        for bucket in range(ALPHA_BUCKETS):
+            color = rgb and blend(rgb["background"], rgb[role], (bucket + 2) / (ALPHA_BUCKETS + 1))
+            specs.append((color, STYLE_SPARK + variant if bucket >= 3 else STYLE_RAIN))
+    for shade in range(RAIN_SHADES):
+        color = rgb and blend(rgb["background"], rgb["secondary"], 1 - 0.75 * shade / (RAIN_SHADES - 1))
+        specs.append((color, STYLE_RAIN if shade < RAIN_SHADES // 2 else STYLE_RAIN_FADE))
+    return specs
+
+
+def xterm256(rgb):
+    """Nearest xterm 256-color palette index: from the 6x6x6 cube or the grey ramp"""
+    levels = (0, 95, 135, 175, 215, 255)
+    steps = [0 if v < 48 else 1 if v < 115 else (v - 35) // 40 for v in rgb]
+    cube = [levels[step] for step in steps]
+    grey_step = min(23, max(0, (sum(rgb) // 3 - 3) // 10))
+    grey = 8 + grey_step * 10
+
+    def distance(color):
+        return sum((a - b) ** 2 for a, b in zip(rgb, color))
+
+    if distance((grey, grey, grey)) < distance(cube):
+        return 232 + grey_step
+    return 16 + 36 * steps[0] + 6 * steps[1] + steps[2]
+
+
+def terminal_colors():
+    """Colors the terminal can show, judged from COLORTERM and TERM"""
+    if os.environ.get("COLORTERM", "").lower() in ("truecolor", "24bit"):
+        return 1 << 24
+    term = os.environ.get("TERM", "")
+    if "256color" in term or term.endswith("-direct"):
+        return 256
+    return 8
+
+
+class FrameBuffer:
+    """Retained cell grid that only redraws cells changed since the last flush
+
+    Producers put() and clear() individual cells; flush() then emits one addstr
+    per cell whose glyph or style actually differs from what is on screen, so the
+    bytes written per frame scale with the number of changed cells rather than
+    with the screen area.
+    """
+
+    def __init__(self, height, width, attrs):
+        self.attrs = attrs  # Style index -> curses attribute
+        self.addstr_calls = 0  # Totals since startup
+        self.bytes_written = 0
+        self.frame_addstr_calls = 0  # Counts for the most recent flush
+        self.frame_bytes = 0
+        self.height, self.width = height, width
+        self.cells = {}  # pos -> (ch, style) wanted on screen
+        self.shown = {}  # pos -> (ch, style) last emitted
+        self.dirty = set()
+        self.recorder = None  # SessionRecorder that gets a copy of every flush
+
+    def resize(self, height, width):
+        """Carry the wanted cells over to a new geometry, dropping those that no longer fit
+
+        The terminal contents are gone after a resize, so nothing counts as
+        shown any more and every kept cell is redrawn on the next flush.
+        Returns the old width, for relocate().
+        """
+        old_width = self.width
+        self.height, self.width = height, width
+        if self.recorder is not None:
+            self.recorder.resize(height, width)
+        cells = {}
+        for pos, cell in self.cells.items():
+            new_pos = self.relocate(pos, old_width)
+            if new_pos is not None:
+                cells[new_pos] = cell
+        self.cells = cells
+        self.shown = {}
+        self.dirty = set(cells)
+        return old_width
+
+    def relocate(self, pos, old_width):
+        """Map a position from a grid old_width wide to the current one; None if off screen"""
+        y, x = divmod(pos, old_width)
+        if y < self.height and x < self.width:
+            return y * self.width + x
+        return None
+
+    def pos(self, y, x):
+        return y * self.width + x
+
+    def put(self, y, x, ch, style, ch_width=1):
+        pos = y * self.width + x
+        self.cells[pos] = (ch, style)
+        self.dirty.add(pos)
+        # A wide glyph paints the cells to its right itself; never write over them
+        for covered in range(pos + 1, pos + ch_width):
+            self.cells.pop(covered, None)
+            self.shown.pop(covered, None)
+            self.dirty.discard(covered)
+        return pos
+
+    def restyle(self, pos, ch, style):
+        """Re-put a cell by position, e.g. when a rain trail cell ages"""
+        self.cells[pos] = (ch, style)
+        self.dirty.add(pos)
+
+    def put_text(self, y, x, text, style):
+        """Put a run of narrow characters starting at (y, x)"""
+        for offset, ch in enumerate(text):
+            self.put(y, x + offset, ch, style)
+
+    def clear(self, pos):
+        if self.cells.pop(pos, None) is not None:
+            self.dirty.add(pos)
+
+    def flush(self, screen, budget=None, first=()):
+        """Emit the changed cells to the screen backend
+
+        With a budget (estimated bytes, escape overhead included) the dirty
+        cells listed in first are always emitted, then the rest in screen order
+        until the budget is spent; cells that did not fit stay dirty for the
+        next flush.
+        """
+        calls = 0
+        written = 0
+        cells, shown, attrs, width = self.cells, self.shown, self.attrs, self.width
+        dirty = self.dirty
+        emitted = [] if self.recorder is not None else None
+        if budget is None:
+            budget = math.inf
+            order = sorted(dirty)  # Left to right, so wide glyphs land last
+            priority_count = 0
+        else:
+            priority = [pos for pos in first if pos in dirty]
+            dirty.difference_update(priority)
+            order = priority + sorted(dirty)
+            priority_count = len(priority)
+        for index, pos in enumerate(order):
+            if written + calls * ESCAPE_BYTES >= budget and index >= priority_count:
+                self.dirty = set(order[index:])
+                break
+            want = cells.get(pos)
+            if want == shown.get(pos):
+                continue
+            if want is None:
+                del shown[pos]
+                ch, style = " ", STYLE_DEFAULT
+            else:
+                shown[pos] = want
+                ch, style = want
+            try:
+                screen.addstr(pos // width, pos % width, ch, attrs[style])
+            except (curses.error, UnicodeEncodeError):
+                pass  # Bottom-right corner and friends
+            calls += 1
+            written += len(ch.encode("utf-8"))
+            if emitted is not None:
+                emitted.append((pos, ch, style))
+        else:
+            self.dirty.clear()
+        if emitted:
+            self.recorder.frame(emitted)
+
+        self.frame_addstr_calls, self.frame_bytes = calls, written
+        self.addstr_calls += calls
+        self.bytes_written += written
+
+    def apply(self, changes):
+        """Replay changes recorded by a RecordingFrameBuffer"""
+        width = self.width
+        for pos, change in changes.items():
+            if change is None:
+                self.clear(pos)
+            elif change[2] is None:
+                self.restyle(pos, change[0], change[1])
+            else:
+                self.put(pos // width, pos % width, *change)
+
+
+class RecordingFrameBuffer(FrameBuffer):
+    """Cell grid owned by the simulation thread; it records changes instead of flushing
+
+    Each entry of changes maps a position to (ch, style, ch_width), to None for
+    a cleared cell, or to (ch, style, None) for a restyle. Only the latest change
+    per position is kept, re-inserted so replay follows the order of the writes.
+    """
+
+    def __init__(self, height, width):
+        super().__init__(height, width, None)
+        self.changes = {}
+
+    def put(self, y, x, ch, style, ch_width=1):
+        pos = y * self.width + x
+        cells, changes = self.cells, self.changes
+        cells[pos] = (ch, style)
+        changes.pop(pos, None)
+        changes[pos] = (ch, style, ch_width)
+        for covered in range(pos + 1, pos + ch_width):
+            cells.pop(covered, None)
+            changes.pop(covered, None)  # Replaying the wide put covers it again
+        return pos
+
+    def restyle(self, pos, ch, style):
+        self.cells[pos] = (ch, style)
+        previous = self.changes.pop(pos, None)
+        self.changes[pos] = (ch, style, previous[2] if previous else None)
+
+    def clear(self, pos):
+        if self.cells.pop(pos, None) is not None:
+            self.changes.pop(pos, None)
+            self.changes[pos] = None
+
+    def resize(self, height, width):
+        old_width = super().resize(height, width)
+        self.dirty = set()
+        self.changes = {}
+        return old_width
+
+    def take_changes(self):
+        changes, self.changes = self.changes, {}
+        return changes
+
+
+class FrameHandoff:
+    """Double buffer of change sets between the simulation and curses threads
+
+    The simulation thread publishes each frame's changes into the back buffer;
+    the curses thread swaps it out whole. Frames published while the terminal
+    was busy are merged rather than queued, so a slow write makes the display
+    skip frames instead of falling behind.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.published = 0  # Frames published / taken, for skip accounting
+        self.taken = 0
+
+    def publish(self, changes):
+        with self.lock:
+            pending = self.pending
+            if not pending:
+                self.pending = changes
+            else:
+                for pos, change in changes.items():
+                    previous = pending.pop(pos, None)
+                    if change is not None and change[2] is None and previous is not None:
+                        change = (change[0], change[1], previous[2])  # Restyle of a pending put
+                    pending[pos] = change
+            self.published += 1
+
+    def take(self):
+        """Swap out everything published since the last take()"""
+        with self.lock:
+            changes, self.pending = self.pending, {}
+            self.taken += 1
+        return changes
+
+
+class RandomStream:
+    """Random numbers served from pre-generated blocks that are refilled in bulk
+
+    One seeded stream feeds particle spawning, rain glyph picks and (through
+    its NumPy generator) the vectorized rain engine, so a seed makes the whole
+    animation reproducible for a given sequence of frame timestamps.
+    """
+
+    BLOCK_SIZE = 4096
+
+    def __init__(self, seed=None):
+        self.seed = seed
+        self.py_random = random.Random(seed)
+        self._rng = None  # NumPy generator, created on first vectorized use
+        self.block = []
+        self.next = 0
+
+    @property
+    def rng(self):
+        """The NumPy generator; asking for it is what imports NumPy"""
+        if self._rng is None:
+            self._rng = np.random.default_rng(self.seed)
+        return self._rng
+
+    def _refill(self):
+        if self._rng is not None:
+            self.block = self._rng.random(self.BLOCK_SIZE).tolist()
+        else:
+            rand = self.py_random.random
+            self.block = [rand() for _ in range(self.BLOCK_SIZE)]
+        self.next = 0
+
+    def random(self):
+        """Uniform float in [0, 1)"""
+        i = self.next
+        if i >= len(self.block):
+            self._refill()
+            i = 0
+        self.next = i + 1
+        return self.block[i]
+
+    def below(self, n):
+        return int(self.random() * n)
+
+    def randint(self, a, b):
+        """Integer in [a, b], both ends included like random.randint"""
+        return a + int(self.random() * (b - a + 1))
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+    def indices(self, n, k):
+        """k indices into range(n), drawn in one bulk call"""
+        if self._rng is not None:
+            return self._rng.integers(0, n, k).tolist()
+        return self.py_random.choices(range(n), k=k)
+
+
+class RainEngine:
+    """Matrix rain drop state, stepped one column at a time in pure Python
+
+    Each column's drop has its own speed in rows per frame (at most 1), so a
+    column only reports a move on frames where its head enters a new row.
+    """
+
+    def __init__(self, width, height, speed_range=(1.0, 1.0), stream=None):
+        self.speed_range = speed_range
+        self.stream = stream or RandomStream()
+        self.cols, self.drops, self.speeds, self.thresholds = [], [], [], []
+        self.resize(width, height)
+
+    def resize(self, width, height):
+        """Fit the rain to a new geometry; columns that still fit keep their drops"""
+        self.width, self.height = width, height
+        self.cols = list(range(0, max(2, width - 1), 1))  # One drop per column for dense rain
+        count = len(self.cols)
+        del self.drops[count:], self.speeds[count:], self.thresholds[count:]
+        added = count - len(self.drops)
+        stream = self.stream
+        self.drops += [float(stream.randint(-height, height)) for _ in range(added)]
+        self.speeds += [stream.uniform(*self.speed_range) for _ in range(added)]
+        self.thresholds += [self._threshold() for _ in range(added)]
+
+        # A shorter screen pulls in restart points that now lie too far below it
+        limit = height + height // 4
+        for i, threshold in enumerate(self.thresholds):
+            if threshold > limit:
+                self.thresholds[i] = self._threshold()
+
+    def _threshold(self):
+        # Drops restart a little past the bottom for a denser effect
+        return self.height + self.stream.randint(0, self.height // 4)
+
+    def step(self):
+        """Advance every drop; return (column index, new row) for heads that moved"""
+        height = self.height
+        drops, speeds, thresholds = self.drops, self.speeds, self.thresholds
+        moved = []
+        for i, drop_y in enumerate(drops):
+            new_y = drop_y + speeds[i]
+            if new_y > thresholds[i]:
+                new_y = float(self.stream.randint(-height // 4, 0))  # Shorter gaps between drops
+                thresholds[i] = self._threshold()
+            drops[i] = new_y
+            row = math.floor(new_y)
+            if row != math.floor(drop_y):
+                moved.append((i, row))
+        return moved
+
+
+class NumpyRainEngine(RainEngine):
+    """Matrix rain drop state held in arrays and advanced with vectorized ops"""
+
+    def __init__(self, width, height, speed_range=(1.0, 1.0), stream=None):
+        self.stream = stream or RandomStream()
+        self.rng = self.stream.rng
+        self.speed_range = speed_range
+        self.drops, self.speeds, self.thresholds = np.empty(0), np.empty(0), np.empty(0, dtype=int)
+        self.resize(width, height)
+
+    def resize(self, width, height):
+        self.width, self.height = width, height
+        self.cols = list(range(0, max(2, width - 1), 1))
+        count = len(self.cols)
+        added = max(0, count - len(self.drops))
+        self.drops = np.concatenate((self.drops[:count],
+                                     self.rng.integers(-height, height + 1, added).astype(float)))
+        self.speeds = np.concatenate((self.speeds[:count],
+                                      self.rng.uniform(self.speed_range[0], self.speed_range[1], added)))
+        self.thresholds = np.concatenate((self.thresholds[:count],
+                                          height + self.rng.integers(0, height // 4 + 1, added)))
+
+        too_far = self.thresholds > height + height // 4
+        self.thresholds[too_far] = height + self.rng.integers(0, height // 4 + 1, int(np.count_nonzero(too_far)))
+
+    def step(self):
+        height = self.height
+        old_rows = np.floor(self.drops)
+        self.drops += self.speeds
+
+        # All respawn draws for this frame come from one batched call
+        respawn = self.drops > self.thresholds
+        respawn_count = int(np.count_nonzero(respawn))
+        if respawn_count:
+            self.drops[respawn] = self.rng.integers(-height // 4, 1, respawn_count)
+            self.thresholds[respawn] = height + self.rng.integers(0, height // 4 + 1, respawn_count)
+
+        new_rows = np.floor(self.drops)
+        moved = np.flatnonzero(new_rows != old_rows)
+        return list(zip(moved.tolist(), new_rows[moved].astype(int).tolist()))
+
+
+class RainTrails:
+    """Per-column ring buffers of the rain cells currently on screen
+
+    When a column's head enters a new row only a constant number of cells are
+    touched: the new head is drawn, the cells crossing into the next shade are
+    restyled and the expiring tail is cleared. The trail effect therefore costs
+    O(columns x shades) per frame, not O(columns x length).
+    """
+
+    def __init__(self, columns, length, canonical):
+        self.length = max(1, length)
+        self.fade_age = self.length - self.length // 3  # Cells this old draw in the fade half
+        styles = [canonical[style] for style in self.age_styles(self.length, self.fade_age)]
+        self.head_style = styles[0]
+        # Only the ages where the style changes need a restyle as the trail moves
+        self.transitions = [(age, styles[age]) for age in range(1, self.length)
+                            if styles[age] != styles[age - 1]]
+        self.positions = [None] * (columns * self.length)  # Flat per-column rings
+        self.glyphs = [None] * (columns * self.length)
+        self.heads = [0] * columns
+
+    @staticmethod
+    def age_styles(length, fade_age):
+        """Style for each age of a trail cell: the head, then the rain shades
+
+        Ages before fade_age spread over the brighter half of the shades, the
+        rest over the dimmer half.
+        """
+        styles = [STYLE_RAIN_HEAD]
+        body = RAIN_SHADES // 2
+        for age in range(1, length):
+            if age < fade_age:
+                shade = (age - 1) * body // max(1, fade_age - 1)
+            else:
+                shade = body + (age - fade_age) * (RAIN_SHADES - body) // (length - fade_age)
+            styles.append(STYLE_RAIN_SHADE + shade)
+        return styles
+
+    def resize(self, columns, frame_buffer, old_width):
+        """Keep the rings of columns that still exist, moving their cells to the new grid"""
+        length = self.length
+        positions = self.positions
+        for slot in range(columns * length, len(positions)):
+            if positions[slot] is not None:
+                pos = frame_buffer.relocate(positions[slot], old_width)
+                if pos is not None:
+                    frame_buffer.clear(pos)
+        del positions[columns * length:], self.glyphs[columns * length:], self.heads[columns:]
+
+        for slot, pos in enumerate(positions):
+            if pos is not None:
+                positions[slot] = frame_buffer.relocate(pos, old_width)
+
+        added = columns - len(self.heads)
+        positions += [None] * (added * length)
+        self.glyphs += [None] * (added * length)
+        self.heads += [0] * added
+
+    def release_masked(self, mask, frame_buffer):
+        """Give up cells that a new layout reserved, before the timer is drawn over them
+
+        Left in the rings, they would be cleared once they age out, taking
+        whatever the timer has drawn there with them.
+        """
+        reserved, positions = mask.cells, self.positions
+        for slot, pos in enumerate(positions):
+            if pos is not None and reserved[pos]:
+                frame_buffer.clear(pos)
+                positions[slot] = None
+
+    def advance(self, frame_buffer, i, y, x, ch, ch_width):
+        """Move column i's head to (y, x); y is None when the head is not drawn"""
+        length = self.length
+        base = i * length
+        positions, glyphs = self.positions, self.glyphs
+
+        head = (self.heads[i] + 1) % length
+        self.heads[i] = head
+
+        # The slot being reused holds the cell that just aged past the trail length
+        slot = base + head
+        if positions[slot] is not None:
+            frame_buffer.clear(positions[slot])
+        if y is None:
+            positions[slot] = None
+        else:
+            positions[slot] = frame_buffer.put(y, x, ch, self.head_style, ch_width)
+            glyphs[slot] = ch
+
+        for age, style in self.transitions:
+            aged = base + (head - age) % length
+            if positions[aged] is not None:
+                frame_buffer.restyle(positions[aged], glyphs[aged], style)
+
+
+# Narrower rain steps faster in pure Python than through NumPy's per-call
+# overhead (80 columns: ~27 us vs ~38 us a step; 400 columns: ~126 us vs ~66 us)
+NUMPY_MIN_COLUMNS = 160
+
+
+def make_rain_engine(width, height, speed_range=(1.0, 1.0), stream=None):
+    """Use the NumPy rain engine when available and the terminal is wide enough to gain from it"""
+    if np is not None and width >= NUMPY_MIN_COLUMNS:
+        return NumpyRainEngine(width, height, speed_range, stream)
+    return RainEngine(width, height, speed_range, stream)
+
+
+class OccupancyMask:
+    """Per-cell map of reserved screen regions, rebuilt only when the layout changes
+
+    Rain and particles test a cell with a single index into a bytearray that
+    shares the FrameBuffer's y * width + x addressing, however many regions
+    (timer, HUD, margins) have been reserved.
+    """
+
+    def __init__(self, height, width):
+        self.height, self.width = height, width
+        self.cells = bytearray(height * width)
+
+    def reserve(self, top, left, bottom, right):
+        """Reserve the inclusive rectangle, clipped to the screen"""
+        top, bottom = max(0, top), min(self.height - 1, bottom)
+        left, right = max(0, left), min(self.width - 1, right)
+        if top > bottom or left > right:
+            return
+        span = b"\x01" * (right - left + 1)
+        for y in range(top, bottom + 1):
+            start = y * self.width + left
+            self.cells[start:start + len(span)] = span
+
+
+class ParticlePool:
+    """Fixed-capacity, struct-of-arrays store for spark/glitch particles
+
+    Live particles are kept packed in slots [0, count); everything past count
+    is the free list. A dying particle is compacted away by moving the last
+    live particle into its slot, so spawning and updating never allocate.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.count = 0
+        self.x = array("d", [0.0]) * capacity
+        self.y = array("d", [0.0]) * capacity
+        self.dx = array("d", [0.0]) * capacity  # movement in x direction
+        self.dy = array("d", [0.0]) * capacity  # movement in y direction
+        self.lifetime = array("i", [0]) * capacity
+        self.max_lifetime = array("i", [0]) * capacity
+        self.color_variant = array("i", [0]) * capacity
+        self.cell = array("q", [-1]) * capacity  # FrameBuffer position currently drawn, or -1
+        self.symbol = [""] * capacity
+
+    def spawn(self, x, y, symbol, lifetime, dx=0, dy=0, color_variant=0):
+        """Take a slot from the free list; returns False when the pool is full"""
+        i = self.count
+        if i >= self.capacity:
+            return False
+        self.x[i], self.y[i], self.dx[i], self.dy[i] = x, y, dx, dy
+        self.lifetime[i] = self.max_lifetime[i] = lifetime
+        self.color_variant[i] = color_variant
+        self.cell[i] = -1
+        self.symbol[i] = symbol
+        self.count = i + 1
+        return True
 
-    # Get safe symbols by actually testing them in the current terminal
-    symbols = get_safe_symbols(stdscr)
-    if not symbols:  # Ultimate fallback
-        symbols = ["|", ":", ".", "*", "#", "+", "-", "="]
+    def kill(self, i):
+        """Release slot i by moving the last live particle into it"""
+        last = self.count - 1
+        if i != last:
+            self.x[i], self.y[i] = self.x[last], self.y[last]
+            self.dx[i], self.dy[i] = self.dx[last], self.dy[last]
+            self.lifetime[i], self.max_lifetime[i] = self.lifetime[last], self.max_lifetime[last]
+            self.color_variant[i] = self.color_variant[last]
+            self.cell[i] = self.cell[last]
+            self.symbol[i] = self.symbol[last]
+        self.count = last
+
+    def relocate_cells(self, frame_buffer, old_width):
+        """Follow the frame buffer into a new geometry after it was resized"""
+        for i in range(self.count):
+            if self.cell[i] >= 0:
+                pos = frame_buffer.relocate(self.cell[i], old_width)
+                self.cell[i] = -1 if pos is None else pos
+
+    def release_masked(self, mask, frame_buffer):
+        """Like RainTrails.release_masked: stop owning cells inside reserved regions"""
+        reserved, cell = mask.cells, self.cell
+        for i in range(self.count):
+            if cell[i] >= 0 and reserved[cell[i]]:
+                frame_buffer.clear(cell[i])
+                cell[i] = -1
+
+
+class CountdownClock:
+    """Time remaining until a wall-clock target, measured on the monotonic clock
+
+    The target is converted to a time.monotonic() deadline once, so NTP slews
+    and DST changes cannot make the display jump from frame to frame. Wall time
+    is only consulted again every REANCHOR_INTERVAL seconds, and the deadline
+    only moves if the two clocks have drifted apart noticeably. Nothing here
+    depends on the renderer.
+    """
+
+    REANCHOR_INTERVAL = 60.0  # Seconds between checks against wall time
+    REANCHOR_TOLERANCE = 0.5  # Drift (seconds) tolerated before the deadline moves
+
+    def __init__(self, target):
+        self.target = target
+        self.target_timestamp = target.timestamp()  # Absolute, so DST can't shift it
+        self.deadline = None
+        self.shown_second = None
+        self._anchor()
+
+    def _anchor(self):
+        now = time.monotonic()
+        deadline = now + (self.target_timestamp - time.time())
+        if self.deadline is None or abs(deadline - self.deadline) > self.REANCHOR_TOLERANCE:
+            self.deadline = deadline
+        self.next_anchor = now + self.REANCHOR_INTERVAL
+
+    def remaining(self):
+        """Seconds left as a float, never negative"""
+        now = time.monotonic()
+        if now >= self.next_anchor:
+            self._anchor()
+        return max(0.0, self.deadline - now)
+
+    def remaining_seconds(self):
+        """Whole seconds left, as displayed"""
+        return int(self.remaining())
+
+    def remaining_hms(self):
+        total_sec = self.remaining_seconds()
+        return total_sec // 3600, (total_sec % 3600) // 60, total_sec % 60
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    def tick(self):
+        """True when the displayed second differs from the last tick() call"""
+        second = self.remaining_seconds()
+        changed = second != self.shown_second
+        self.shown_second = second
+        return changed
+
+
+class RemoteClock(CountdownClock):
+    """A countdown driven by a daemon's ticks instead of a wall-clock target
+
+    Each tick reports the seconds remaining; in between, the clock runs down
+    on the local monotonic clock. The deadline only moves when a tick disagrees
+    by more than TOLERANCE, so socket latency cannot make a second flicker.
+    """
+
+    TOLERANCE = 0.1
+
+    def __init__(self, remaining):
+        self.deadline = None
+        self.shown_second = None
+        self.update(remaining)
+
+    def update(self, remaining):
+        deadline = time.monotonic() + remaining
+        if self.deadline is None or abs(deadline - self.deadline) > self.TOLERANCE:
+            self.deadline = deadline
+
+    def remaining(self):
+        return max(0.0, self.deadline - time.monotonic())
+
+
+class FrameStats:
+    """Frame-time statistics collected by the FrameScheduler"""
+
+    def __init__(self, window=1200):
+        self.frames = 0
+        self.missed = 0  # Frames that finished after their deadline
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.recent = deque(maxlen=window)  # Recent frame times for percentiles
+        self.started = time.monotonic()
+
+    def record(self, frame_time, missed):
+        self.frames += 1
+        self.missed += missed
+        self.total_time += frame_time
+        self.max_time = max(self.max_time, frame_time)
+        self.recent.append(frame_time)
+
+    def percentile(self, pct):
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def summary(self):
+        elapsed = max(1e-9, time.monotonic() - self.started)
+        avg_ms = self.total_time / self.frames * 1000 if self.frames else 0.0
+        return (f"{self.frames} frames in {elapsed:.1f}s ({self.frames / elapsed:.1f} fps), "
+                f"{self.missed} missed deadlines, frame time avg {avg_ms:.2f} ms, "
+                f"p50 {self.percentile(50) * 1000:.2f} ms, p99 {self.percentile(99) * 1000:.2f} ms, "
+                f"max {self.max_time * 1000:.2f} ms")
+
+
+class FrameScheduler:
+    """Paces the render loop against monotonic deadlines
+
+    Sleeping until the next deadline (rather than a fixed interval after each
+    frame) compensates for render time, so the frame rate holds under load. A
+    frame that overruns its deadline is counted as missed and the schedule is
+    re-anchored instead of trying to catch up with a burst of frames.
+    """
+
+    LOW_POWER_FPS = 2
+
+    def __init__(self, fps=20, low_power=False):
+        self.fps = fps
+        self.low_power_allowed = low_power  # Whether idle conditions may drop the rate
+        self.low_power = False
+        self.fps_limit = None  # Cap set by the bandwidth governor
+        self.stats = FrameStats()
+        self.deadline = self.frame_start = time.monotonic()
+
+    @property
+    def interval(self):
+        if self.low_power:
+            return 1.0 / self.LOW_POWER_FPS
+        if self.fps_limit is not None:
+            return 1.0 / min(self.fps, self.fps_limit)
+        return 1.0 / self.fps
+
+    def start(self):
+        """Anchor the schedule at the first frame, after any startup work"""
+        self.deadline = self.frame_start = self.stats.started = time.monotonic()
+
+    def set_idle(self, idle):
+        """Drop to the low-power rate while idle, if low-power mode is enabled"""
+        self.low_power = self.low_power_allowed and idle
+
+    def wait(self):
+        """Finish the current frame and sleep until the next one is due"""
+        now = time.monotonic()
+        self.deadline += self.interval
+        missed = now > self.deadline
+        self.stats.record(now - self.frame_start, missed)
+        if missed:
+            self.deadline = now
+        else:
+            time.sleep(self.deadline - now)
+        self.frame_start = time.monotonic()
+
+
+class BandwidthGovernor:
+    """Keeps estimated terminal output under a --max-bps budget
+
+    Output is estimated from each flush (glyph bytes plus ESCAPE_BYTES per
+    cell), and every flush is capped at the budget's share of a frame with the
+    timer cells sent first, so the digits always update. Cells that did not
+    fit are left dirty; while such a backlog persists the governor steps down
+    one level, at most once a second: first thinning the rain, then the
+    particles, then the frame rate. It steps back up once there is no backlog
+    and the rate is under half the budget.
+    """
+
+    # (rain column stride or 0 for no rain, particle fraction, fps limit)
+    LEVELS = (
+        (1, 1.0, None),
+        (2, 1.0, None),
+        (4, 1.0, None),
+        (8, 1.0, None),
+        (0, 1.0, None),
+        (0, 0.5, None),
+        (0, 0.0, None),
+        (0, 0.0, 10),
+        (0, 0.0, 4),
+        (0, 0.0, 1),  # One update a second still moves the seconds digit
+    )
+    ADJUST_INTERVAL = 1.0
+
+    def __init__(self, max_bps):
+        self.max_bps = max_bps
+        self.budget = max_bps / 8  # Bytes per second
+        self.level = 0
+        self.rate = 0.0  # Smoothed estimated bytes per second
+        self.last_adjust = None
+
+    def frame_budget(self, interval):
+        return self.budget * interval
+
+    def record(self, frame_bytes, frame_calls, backlog, interval, now=None):
+        """Feed one flush's output and leftover cell count; True when the level changed"""
+        now = time.monotonic() if now is None else now
+        if self.last_adjust is None:
+            self.last_adjust = now
+        sent = frame_bytes + frame_calls * ESCAPE_BYTES
+        self.rate += 0.2 * (sent / interval - self.rate)
+        if now - self.last_adjust < self.ADJUST_INTERVAL:
+            return False
+        if backlog and self.level < len(self.LEVELS) - 1:
+            self.level += 1
+        elif not backlog and self.rate < self.budget * 0.5 and self.level > 0:
+            self.level -= 1
+        else:
+            return False
+        self.last_adjust = now
+        return True
 
-    # Particle-specific symbols (sparks and glitches)
-    spark_symbols = ["*", ".", "·", "°", "˚", "•", "◦", "○", "◯"]
-    glitch_symbols = ["#", "@", "&", "%", "?", "!", "~", "^", "¿", "¡"]
+    def apply(self, scene, scheduler):
+        rain_stride, particle_fraction, fps_limit = self.LEVELS[self.level]
+        scene.rain_stride = rain_stride
+        scene.particle_limit = int(scene.particles.capacity * particle_fraction)
+        scheduler.fps_limit = fps_limit
+        scene.output_budget = self.frame_budget(scheduler.interval)
 
-    # Test which particle symbols work
-    working_sparks = [s for s in spark_symbols if test_symbol_safely(stdscr, s)]
-    working_glitches = [s for s in glitch_symbols if test_symbol_safely(stdscr, s)]
 
-    if not working_sparks:
-        working_sparks = ["*", ".", "+"]
-    if not working_glitches:
-        working_glitches = ["#", "@", "?"]
+class TerminalInput:
+    """Non-blocking reader for keys and terminal events such as focus changes"""
 
-    # Initialize matrix state with denser rain
-    height, width = stdscr.getmaxyx()
-    cols = list(range(0, max(2, width - 1), 1))  # Changed from step 2 to step 1 for more columns
-    drops = [random.randint(-height, height) for _ in cols]
+    FOCUS_IN = (27, ord("["), ord("I"))
+    FOCUS_OUT = (27, ord("["), ord("O"))
 
-    # Initialize particle system
-    particles = []
-    last_particle_spawn = time.time()
+    def __init__(self, screen, report_focus=False):
+        self.screen = screen
+        self.report_focus = report_focus
+        self.focused = True
+        self.resized = False  # Set by poll() when curses reported KEY_RESIZE
+        screen.nodelay(True)
+        if report_focus:
+            self._write_control("\x1b[?1004h")  # Ask the terminal to report focus changes
 
-    si = 0
-    cursor_visible = True
-    last_toggle = time.time()
-    last_resize_check = time.time()
+    def close(self):
+        if self.report_focus:
+            self._write_control("\x1b[?1004l")
 
-    while True:
-        current_time = time.time()
+    @staticmethod
+    def _write_control(seq):
+        try:
+            sys.stdout.write(seq)
+            sys.stdout.flush()
+        except OSError:
+            pass
 
-        # Check for terminal resize every 0.5 seconds
-        if current_time - last_resize_check >= 0.5:
+    def poll(self):
+        """Drain pending input; returns the key codes that were not terminal events"""
+        codes = []
+        while True:
             try:
-                new_height, new_width = stdscr.getmaxyx()
-                if new_height != height or new_width != width:
-                    height, width = new_height, new_width
-                    cols = list(range(0, max(2, width - 1), 1))  # Denser columns
-                    drops = [random.randint(-height, height) for _ in cols]
+                code = self.screen.getch()
             except curses.error:
+                break
+            if code == -1:
+                break
+            codes.append(code)
+
+        keys = []
+        self.resized = False
+        i = 0
+        while i < len(codes):
+            seq = tuple(codes[i:i + 3])
+            if seq == self.FOCUS_IN or seq == self.FOCUS_OUT:
+                self.focused = seq == self.FOCUS_IN
+                i += 3
+            elif codes[i] == curses.KEY_RESIZE:
+                # ncurses turns SIGWINCH into KEY_RESIZE after updating its own size
+                self.resized = True
+                i += 1
+            else:
+                keys.append(codes[i])
+                i += 1
+        return keys
+
+
+class NullProfiler:
+    """Stand-in used when instrumentation is off; every hook is a no-op"""
+
+    hud_visible = False
+
+    def start_frame(self):
+        pass
+
+    def mark(self, phase):
+        pass
+
+    def end_frame(self, particles, addstr_calls, bytes_written):
+        pass
+
+    def toggle_hud(self):
+        pass
+
+    def hud_lines(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class FrameProfiler:
+    """Per-phase timers around each stage of the render loop
+
+    Each mark() charges the time since the previous mark to the named phase.
+    Averages over the last interval feed the on-screen HUD and, optionally, a
+    JSON-lines log with one record per interval.
+    """
+
+    PHASES = ("input", "particle_spawn", "particle_update", "rain", "timer", "flush", "refresh", "sleep")
+    HUD_WIDTH = 72
+    HUD_HEIGHT = len(PHASES) + 1
+
+    def __init__(self, log_path=None, interval=1.0, hud_visible=True):
+        self.interval = interval
+        self.hud_visible = hud_visible
+        self.log = open(log_path, "a", encoding="utf-8", buffering=1) if log_path else None
+        self._reset_window(time.monotonic())
+        self._last = time.perf_counter()
+        self._hud = []
+
+    def _reset_window(self, now):
+        self.window_start = now
+        self.frames = 0
+        self.phase_totals = dict.fromkeys(self.PHASES, 0.0)
+        self.addstr_calls = 0
+        self.bytes_written = 0
+        self.particles = 0
+
+    def start_frame(self):
+        self._last = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phase_totals[phase] += now - self._last
+        self._last = now
+
+    def end_frame(self, particles, addstr_calls, bytes_written):
+        self.frames += 1
+        self.addstr_calls += addstr_calls
+        self.bytes_written += bytes_written
+        self.particles = particles
+
+        now = time.monotonic()
+        if now - self.window_start >= self.interval:
+            self._publish(now)
+
+    def _publish(self, now):
+        frames = max(1, self.frames)
+        phase_ms = {phase: round(total / frames * 1000, 3) for phase, total in self.phase_totals.items()}
+        record = {
+            "time": round(time.time(), 3),
+            "fps": round(self.frames / (now - self.window_start), 2),
+            "phase_ms": phase_ms,
+            "particles": self.particles,
+            "addstr_per_frame": round(self.addstr_calls / frames, 1),
+            "bytes_per_frame": round(self.bytes_written / frames, 1),
+        }
+        if self.log is not None:
+            try:
+                self.log.write(json.dumps(record) + "\n")
+            except OSError:
                 pass
-            last_resize_check = current_time
 
-        now = datetime.now()
-        remaining = target - now
+        busy_ms = sum(ms for phase, ms in phase_ms.items() if phase != "sleep")
+        self._hud = [f"{record['fps']:5.1f} fps  {busy_ms:6.2f} ms busy  "
+                     f"{record['particles']} particles  {record['addstr_per_frame']} addstr/f"]
+        self._hud += [f"{phase:>15} {ms:7.3f} ms" for phase, ms in phase_ms.items()]
+        self._reset_window(now)
 
-        if remaining.total_seconds() <= 0:
-            try:
-                stdscr.erase()
-                msg = "✓ TIME'S UP! ✓"
-                msg_width = safe_wcswidth(msg)
-                x = max(0, min(width - msg_width, (width - msg_width) // 2))
-                y = max(0, min(height - 1, height // 2))
-                stdscr.addstr(y, x, msg, color_pair)
-                stdscr.refresh()
-            except (curses.error, UnicodeEncodeError):
-                # Fallback without checkmarks
-                try:
-                    msg = "TIME'S UP!"
-                    msg_width = safe_wcswidth(msg)
-                    x = max(0, min(width - msg_width, (width - msg_width) // 2))
-                    y = max(0, min(height - 1, height // 2))
-                    stdscr.addstr(y, x, msg, color_pair)
-                    stdscr.refresh()
-                except curses.error:
-                    pass
-            time.sleep(3)
-            break
+    def toggle_hud(self):
+        self.hud_visible = not self.hud_visible
 
-        # Compute time safely
-        total_sec = max(0, int(remaining.total_seconds()))
-        h = total_sec // 3600
-        m = (total_sec % 3600) // 60
-        s = total_sec % 60
+    def hud_lines(self):
+        return self._hud if self.hud_visible else []
 
-        # Toggle blinking cursor
-        if current_time - last_toggle >= 0.5:
-            cursor_visible = not cursor_visible
-            last_toggle = current_time
+    def close(self):
+        if self.log is not None:
+            self.log.close()
+            self.log = None
 
-        # Get frame and cursor
-        frame = spinner_frames[si % len(spinner_frames)]
-        cursor = block_cursor if cursor_visible else " "
-        si += 1
 
-        # Build timer by DRAWING EACH PART SEPARATELY (no string concatenation)
-        time_part = f"{h:02d}:{m:02d}:{s:02d}"
+class CursesScreen:
+    """Screen backend drawing to a real curses window"""
+
+    def __init__(self, stdscr):
+        self.stdscr = stdscr
+        self.addstr = stdscr.addstr  # Bound directly; this is the per-cell hot path
+        self.getch = stdscr.getch
+        self.nodelay = stdscr.nodelay
+
+    def size(self):
+        return self.stdscr.getmaxyx()
+
+    def refresh(self):
+        try:
+            self.stdscr.refresh()
+        except curses.error:
+            pass
+
+    def erase(self):
+        try:
+            self.stdscr.erase()
+        except curses.error:
+            pass
+
+    def glyph_groups(self, reprobe=False):
+        # Probe glyphs once per terminal environment; warm starts come from the cache
+        return load_glyph_groups(self.stdscr, reprobe=reprobe)
+
+    def init_styles(self, theme):
+        """Set up color pairs for theme; returns the attribute for each style index"""
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass
+
+        # Initialize colors based on selected theme
+        if curses.has_colors():
+            curses.start_color()
+            deep = theme.rgb is not None and curses.COLORS >= 256
+
+            def color(role):
+                return self._color(theme.rgb[role]) if deep else theme.basic(role)
+
+            background = color("background")
+            curses.init_pair(1, color("primary"), background)  # Main countdown
+            curses.init_pair(2, color("secondary"), background)  # Matrix rain
+            curses.init_pair(3, color("accent1"), background)  # Spark color 1
+            curses.init_pair(4, color("accent2"), background)  # Spark color 2
+            curses.init_pair(5, color("urgent"), background)  # Urgent/glitch color
+            curses.init_pair(6, color("accent1"), background)  # Extra accent
+            curses.init_pair(7, color("head"), background)  # Rain trail head
+
+            color_pair = curses.color_pair(1) | curses.A_BOLD  # Main countdown
+            matrix_color = curses.color_pair(2) | curses.A_BOLD  # Matrix rain
+            rain_head_color = curses.color_pair(7) | curses.A_BOLD  # Leading glyph of a trail
+            rain_fade_color = curses.color_pair(2) | curses.A_DIM  # Tail end of a trail
+            spark_colors = [
+                curses.color_pair(3) | curses.A_BOLD,  # Accent 1
+                curses.color_pair(4) | curses.A_BOLD,  # Accent 2
+                curses.color_pair(5) | curses.A_BOLD,  # Urgent
+                curses.color_pair(6) | curses.A_BOLD,  # Extra accent
+            ]
+        else:
+            deep = False
+            color_pair = curses.A_BOLD
+            matrix_color = curses.A_BOLD
+            rain_head_color = curses.A_BOLD
+            rain_fade_color = curses.A_DIM
+            spark_colors = [curses.A_BOLD, curses.A_REVERSE, curses.A_UNDERLINE, curses.A_BOLD]
+
+        attrs = [curses.A_NORMAL, color_pair, matrix_color, rain_head_color, rain_fade_color] + spark_colors
+        return attrs + self._gradient_attrs(theme, attrs, deep)
+
+    def _color(self, rgb):
+        if curses.COLORS >= 1 << 24:
+            return (rgb[0] << 16) | (rgb[1] << 8) | rgb[2]  # Direct-color terminfo, e.g. xterm-direct
+        return xterm256(rgb)
+
+    def _gradient_attrs(self, theme, attrs, deep):
+        """One color pair per distinct gradient color, after the 7 the base styles use"""
+        specs = gradient_specs(theme)
+        if deep:
+            background = self._color(theme.rgb["background"])
+            pairs = {}
+            gradient = []
+            try:
+                for rgb, _ in specs:
+                    color = self._color(rgb)
+                    pair = pairs.get(color)
+                    if pair is None:
+                        pair = pairs[color] = 8 + len(pairs)
+                        curses.init_pair(pair, color, background)
+                    gradient.append(curses.color_pair(pair))
+                return gradient
+            except (curses.error, ValueError, OverflowError):
+                pass  # Too few color pairs, or no extended pair support
+        return [attrs[fallback] for _, fallback in specs]
+
+
+class AnsiScreen:
+    """Screen backend writing ANSI escape sequences straight to the terminal
+
+    Bypasses curses: addstr() only records the cell in this backend's own grid,
+    and refresh() builds one buffer holding cursor moves (CUP) and SGR changes
+    for the cells that differ from what the terminal shows. A cell that
+    continues the previous one with the same attributes needs neither, so runs
+    coalesce. The buffer goes out in a single os.write.
+    """
+
+    def __init__(self, out_fd=1, in_fd=0, size=None, colors=None):
+        self.out_fd, self.in_fd = out_fd, in_fd
+        self.colors = terminal_colors() if colors is None else colors
+        self.fixed_size = size
+        self.height, self.width = self.size()
+        self.cells = {}  # pos -> (ch, sgr) wanted
+        self.shown = {}  # pos -> (ch, sgr) on the terminal
+        self.dirty = set()
+        self.widths = {}  # Glyph -> display width
+        self.clear_pending = True
+        self.normal = "\x1b[0m"
+        self.keys = deque()
+        self.resized = False
+        self.saved_mode = None
+        self.addstr_calls = 0
+        self.bytes_written = 0
+        self.writes = 0
+
+    def start(self):
+        """Take over the terminal: cbreak input, alternate screen, hidden cursor"""
+        if self.in_fd is not None and os.isatty(self.in_fd):
+            self.saved_mode = termios.tcgetattr(self.in_fd)
+            tty.setcbreak(self.in_fd)
+        signal.signal(signal.SIGWINCH, self._on_resize)
+        self._write("\x1b[?1049h\x1b[?25l")
+
+    def stop(self):
+        signal.signal(signal.SIGWINCH, signal.SIG_DFL)
+        self._write("\x1b[0m\x1b[?25h\x1b[?1049l")
+        if self.saved_mode is not None:
+            termios.tcsetattr(self.in_fd, termios.TCSADRAIN, self.saved_mode)
+
+    def _on_resize(self, signum, frame):
+        self.resized = True
+
+    def size(self):
+        if self.fixed_size is not None:
+            return self.fixed_size
+        try:
+            columns, lines = os.get_terminal_size(self.out_fd)
+        except OSError:
+            columns, lines = shutil.get_terminal_size()
+        return lines, columns
+
+    def _width(self, ch):
+        ch_width = self.widths.get(ch)
+        if ch_width is None:
+            ch_width = self.widths[ch] = max(1, safe_wcswidth(ch))
+        return ch_width
+
+    def addstr(self, y, x, text, attr=""):
+        if not (0 <= y < self.height and 0 <= x < self.width):
+            return
+        self.addstr_calls += 1
+        cells, dirty, width = self.cells, self.dirty, self.width
+        pos = y * width + x
+        end = (y + 1) * width
+        for ch in text:
+            ch_width = self._width(ch)
+            if pos + ch_width > end:
+                break
+            cells[pos] = (ch, attr)
+            dirty.add(pos)
+            for covered in range(pos + 1, pos + ch_width):
+                # The terminal paints these with the wide glyph
+                cells.pop(covered, None)
+                self.shown.pop(covered, None)
+                dirty.discard(covered)
+            pos += ch_width
+
+    def refresh(self):
+        out = []
+        if self.clear_pending:
+            out.append("\x1b[0m\x1b[2J")
+            self.clear_pending = False
+        cells, shown, width, normal = self.cells, self.shown, self.width, self.normal
+        cursor = -1
+        sgr = None
+        for pos in sorted(self.dirty):
+            want = cells.get(pos)
+            if want == shown.get(pos):
+                continue
+            if want is None:
+                del shown[pos]
+                ch, attr = " ", normal
+            else:
+                shown[pos] = want
+                ch, attr = want
+            if pos != cursor:
+                out.append(f"\x1b[{pos // width + 1};{pos % width + 1}H")
+            if attr != sgr:
+                out.append(attr)
+                sgr = attr
+            out.append(ch)
+            cursor = pos + self._width(ch)
+        self.dirty.clear()
+        if out:
+            self._write("".join(out))
+
+    def _write(self, text):
+        data = text.encode("utf-8")
+        self.writes += 1
+        self.bytes_written += len(data)
+        while data:
+            try:
+                written = os.write(self.out_fd, data)
+            except InterruptedError:
+                continue
+            except BlockingIOError:
+                select.select([], [self.out_fd], [])
+                continue
+            data = data[written:]
+
+    def erase(self):
+        self.cells = {}
+        self.shown = {}
+        self.dirty = set()
+        self.clear_pending = True
+
+    def getch(self):
+        if self.resized:
+            self.resized = False
+            self.height, self.width = self.size()
+            self.erase()
+            return curses.KEY_RESIZE
+        if not self.keys and self.in_fd is not None:
+            try:
+                if select.select([self.in_fd], [], [], 0)[0]:
+                    self.keys.extend(os.read(self.in_fd, 1024))
+            except (OSError, InterruptedError):
+                pass
+        return self.keys.popleft() if self.keys else -1
+
+    def nodelay(self, flag):
+        pass  # getch() never blocks
+
+    def glyph_groups(self, reprobe=False):
+        # There is no off-screen pad to probe with: reuse what a curses run
+        # probed for this terminal, else trust wcwidth and the encoding
+        groups = None
+        if not reprobe:
+            groups = GlyphProbeCache().get(probe_cache_key(self.height, self.width))
+        return groups if groups is not None else probe_glyph_groups(None)
+
+    def init_styles(self, theme):
+        """Map the theme's colors to SGR sequences, one per style index"""
+        deep = theme.rgb is not None and self.colors >= 256
+        if deep:
+            background = self._color(theme.rgb["background"], 48)
+        else:
+            background = 40 + theme.background
+
+        def sgr(role, weight=1):
+            color = self._color(theme.rgb[role], 38) if deep else 30 + theme.basic(role)
+            return f"\x1b[0;{weight};{color};{background}m"
+
+        attrs = [
+            self.normal,
+            sgr("primary"),  # Main countdown
+            sgr("secondary"),  # Matrix rain
+            sgr("head"),  # Rain trail head
+            sgr("secondary", 2),  # Tail end of a trail
+            sgr("accent1"),  # Accent 1
+            sgr("accent2"),  # Accent 2
+            sgr("urgent"),  # Urgent
+            sgr("accent1"),  # Extra accent
+        ]
+        for rgb, fallback in gradient_specs(theme):
+            if deep:
+                attrs.append(f"\x1b[0;{self._color(rgb, 38)};{background}m")
+            else:
+                attrs.append(attrs[fallback])
+        return attrs
+
+    def _color(self, rgb, base):
+        """SGR parameters for an RGB color; base is 38 for foreground, 48 for background"""
+        if self.colors >= 1 << 24:
+            return f"{base};2;{rgb[0]};{rgb[1]};{rgb[2]}"
+        return f"{base};5;{xterm256(rgb)}"
+
+
+def ansi_wrapper(func, *args):
+    """Like curses.wrapper, but runs func on an AnsiScreen"""
+    screen = AnsiScreen()
+    screen.start()
+    try:
+        return func(screen, *args)
+    finally:
+        screen.stop()
+
+
+class MemoryScreen:
+    """Headless screen backend: an in-memory cell grid that records every write
+
+    Needs no terminal, so the renderer can be driven and measured in CI.
+    """
+
+    def __init__(self, height, width, colors=8):
+        self.height, self.width = height, width
+        self.colors = colors
+        self.grid = [[" "] * width for _ in range(height)]
+        self.addstr_calls = 0
+        self.bytes_written = 0
+        self.refreshes = 0
+
+    def size(self):
+        return self.height, self.width
+
+    def addstr(self, y, x, text, attr=0):
+        if not (0 <= y < self.height and 0 <= x < self.width):
+            raise curses.error("addstr() returned ERR")
+        self.addstr_calls += 1
+        self.bytes_written += len(text.encode("utf-8"))
+        row = self.grid[y]
+        for offset, ch in enumerate(text[:self.width - x]):
+            row[x + offset] = ch
+
+    def refresh(self):
+        self.refreshes += 1
+
+    def erase(self):
+        self.grid = [[" "] * self.width for _ in range(self.height)]
+
+    def resize(self, height, width):
+        self.height, self.width = height, width
+        self.erase()
+
+    def getch(self):
+        return -1
+
+    def nodelay(self, flag):
+        pass
+
+    def glyph_groups(self, reprobe=False):
+        # No terminal to ask, so accept whatever wcwidth and UTF-8 can represent
+        return probe_glyph_groups(None)
+
+    def init_styles(self, theme):
+        # Style indices double as attributes; without 256 colors the gradients
+        # fall back to the same styles as on a real terminal
+        attrs = list(range(STYLE_SPARK_FADE))
+        deep = theme.rgb is not None and self.colors >= 256
+        for style, (_, fallback) in enumerate(gradient_specs(theme), STYLE_SPARK_FADE):
+            attrs.append(style if deep else fallback)
+        return attrs
+
+    def lines(self):
+        return ["".join(row) for row in self.grid]
+
+
+# Session recordings: a magic line, a JSON header, then records of
+# tag byte + varint payload length + payload. Every record payload starts with
+# the milliseconds since the previous record.
+SESSION_MAGIC = b"RCREC1\n"
+RECORD_FRAME = ord("F")  # Cells emitted by one flush
+RECORD_RESIZE = ord("S")  # New geometry; the cells that follow redraw the screen
+RECORD_MESSAGE = ord("M")  # Text written outside the frame buffer (the times-up banner)
+RECORD_END = ord("E")  # Recording closed; holds the last frame's on-screen time
+
+
+def put_varint(out, value):
+    """Append a non-negative int to a bytearray as a LEB128 varint"""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def get_varint(data, index):
+    """Decode a varint from data at index; returns (value, next index)"""
+    value = shift = 0
+    while True:
+        byte = data[index]
+        index += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, index
+        shift += 7
+
+
+def put_string(out, text):
+    encoded = text.encode("utf-8")
+    put_varint(out, len(encoded))
+    out += encoded
+
+
+def get_string(data, index):
+    length, index = get_varint(data, index)
+    return data[index:index + length].decode("utf-8"), index + length
+
+
+class SessionRecorder:
+    """Write what the frame buffer emits to a compact replay file
+
+    A frame costs one record: cells in screen order, each as a varint gap
+    since the previous cell, a style byte and a glyph id, so a typical cell
+    takes 3 bytes. Glyph ids count up from 0 in order of first use; the first
+    use of an id is followed by the glyph itself. Records collect in memory
+    and are written out whenever FLUSH_BYTES have built up or FLUSH_INTERVAL
+    has passed, which keeps file I/O off most frames and bounds both the
+    buffer and what a crash can lose.
+    """
+
+    FLUSH_BYTES = 64 * 1024
+    FLUSH_INTERVAL = 1.0
+
+    def __init__(self, path, theme_name):
+        self.file = open(path, "wb")
+        self.theme_name = theme_name
+        self.buffer = bytearray()
+        self.glyph_ids = {}
+        self.last_time = None
+        self.last_flush = 0.0
+        self.records = 0
+        self.bytes_written = 0
+
+    def start(self, height, width):
+        """Write the header; the first frame is timed from here"""
+        header = json.dumps({"height": height, "width": width, "theme": self.theme_name,
+                             "started": time.time()}).encode("utf-8")
+        self.buffer += SESSION_MAGIC
+        put_varint(self.buffer, len(header))
+        self.buffer += header
+        self.last_time = self.last_flush = time.monotonic()
+
+    def _record(self, tag, payload):
+        now = time.monotonic()
+        elapsed_ms = int(round((now - self.last_time) * 1000))
+        self.last_time += elapsed_ms / 1000  # Rounding errors do not accumulate
+        record = bytearray()
+        put_varint(record, elapsed_ms)
+        record += payload
+        buffer = self.buffer
+        buffer.append(tag)
+        put_varint(buffer, len(record))
+        buffer += record
+        self.records += 1
+        if len(buffer) >= self.FLUSH_BYTES or now - self.last_flush >= self.FLUSH_INTERVAL:
+            self.flush(now)
+
+    def frame(self, emitted):
+        """Record one flush's (pos, ch, style) cells"""
+        glyph_ids = self.glyph_ids
+        payload = bytearray()
+        put_varint(payload, len(emitted))
+        previous = -1
+        # Single-byte varints are written inline; this runs for every cell drawn
+        for pos, ch, style in sorted(emitted):
+            gap = pos - previous - 1
+            if gap < 0x80:
+                payload.append(gap)
+            else:
+                put_varint(payload, gap)
+            payload.append(style)
+            glyph = glyph_ids.get(ch)
+            if glyph is None:
+                glyph = glyph_ids[ch] = len(glyph_ids)
+                put_varint(payload, glyph)
+                put_string(payload, ch)
+            elif glyph < 0x80:
+                payload.append(glyph)
+            else:
+                put_varint(payload, glyph)
+            previous = pos
+        self._record(RECORD_FRAME, payload)
+
+    def resize(self, height, width):
+        payload = bytearray()
+        put_varint(payload, height)
+        put_varint(payload, width)
+        self._record(RECORD_RESIZE, payload)
+
+    def message(self, y, x, text, style):
+        payload = bytearray()
+        put_varint(payload, y)
+        put_varint(payload, x)
+        payload.append(style)
+        put_string(payload, text)
+        self._record(RECORD_MESSAGE, payload)
+
+    def flush(self, now=None):
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.file.flush()
+            self.bytes_written += len(self.buffer)
+            self.buffer = bytearray()
+        self.last_flush = time.monotonic() if now is None else now
+
+    def close(self):
+        if self.file.closed:
+            return
+        if self.last_time is not None:
+            self._record(RECORD_END, b"")
+        self.flush()
+        self.file.close()
+
+
+class SessionReader:
+    """Read a recording back: header holds the JSON header, iterating yields
+    (seconds since start, tag, fields) per record
+
+    Records are read one at a time, so long recordings stream from disk. A
+    record cut short, e.g. by a crash mid-write, ends the stream quietly.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        if self.file.read(len(SESSION_MAGIC)) != SESSION_MAGIC:
+            self.file.close()
+            raise ValueError(f"{path} is not a countdown recording")
+        length = self._read_varint()
+        self.header = json.loads(self.file.read(length or 0) or "{}")
+        self.glyphs = []  # Glyph id -> glyph
+        if "height" not in self.header or "width" not in self.header:
+            self.file.close()
+            raise ValueError(f"{path} has a damaged header")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.file.close()
+
+    def _read_varint(self):
+        value = shift = 0
+        while True:
+            byte = self.file.read(1)
+            if not byte:
+                return None
+            value |= (byte[0] & 0x7F) << shift
+            if byte[0] < 0x80:
+                return value
+            shift += 7
+
+    def __iter__(self):
+        elapsed_ms = 0
+        while True:
+            tag = self.file.read(1)
+            length = self._read_varint() if tag else None
+            if length is None:
+                return
+            payload = self.file.read(length)
+            if len(payload) < length:
+                return
+            delta, index = get_varint(payload, 0)
+            elapsed_ms += delta
+            yield elapsed_ms / 1000, tag[0], self._decode(tag[0], payload, index)
+
+    def _decode(self, tag, payload, index):
+        if tag == RECORD_FRAME:
+            glyphs = self.glyphs
+            count, index = get_varint(payload, index)
+            cells = []
+            pos = -1
+            for _ in range(count):
+                gap, index = get_varint(payload, index)
+                pos += gap + 1
+                style = payload[index]
+                glyph, index = get_varint(payload, index + 1)
+                if glyph == len(glyphs):
+                    ch, index = get_string(payload, index)
+                    glyphs.append(ch)
+                cells.append((pos, glyphs[glyph], style))
+            return cells
+        if tag == RECORD_RESIZE:
+            height, index = get_varint(payload, index)
+            width, index = get_varint(payload, index)
+            return height, width
+        if tag == RECORD_MESSAGE:
+            y, index = get_varint(payload, index)
+            x, index = get_varint(payload, index)
+            style = payload[index]
+            text, index = get_string(payload, index + 1)
+            return y, x, style, text
+        return None  # RECORD_END, or a record type from a newer version
+
+
+class SessionPlayer:
+    """Redraw recorded records on a screen backend; nothing is simulated"""
+
+    def __init__(self, screen, header, theme):
+        self.screen = screen
+        self.frame_buffer = FrameBuffer(header["height"], header["width"], screen.init_styles(theme))
+        self.message = None
+
+    def apply(self, tag, fields):
+        frame_buffer = self.frame_buffer
+        if tag == RECORD_FRAME:
+            for pos, ch, style in fields:
+                frame_buffer.restyle(pos, ch, style)
+            frame_buffer.flush(self.screen)
+        elif tag == RECORD_RESIZE:
+            # The recording redraws every cell after a resize, so start empty
+            self.frame_buffer = FrameBuffer(fields[0], fields[1], frame_buffer.attrs)
+            self.screen.erase()
+        elif tag == RECORD_MESSAGE:
+            self.message = fields
+            self._draw_message()
+        else:
+            return
+        self.screen.refresh()
+
+    def _draw_message(self):
+        y, x, style, text = self.message
+        self.screen.erase()
+        try:
+            self.screen.addstr(y, x, text, self.frame_buffer.attrs[style])
+        except (curses.error, UnicodeEncodeError):
+            pass
+
+    def redraw(self):
+        """Repaint everything, e.g. after the replaying terminal was resized"""
+        if self.message is not None:
+            self._draw_message()
+        else:
+            self.screen.erase()
+            frame_buffer = self.frame_buffer
+            frame_buffer.resize(frame_buffer.height, frame_buffer.width)
+            frame_buffer.flush(self.screen)
+        self.screen.refresh()
+
+
+class CastScreen(AnsiScreen):
+    """AnsiScreen that collects its escape sequences for an asciicast file instead of writing them"""
+
+    def __init__(self, height, width):
+        super().__init__(out_fd=None, in_fd=None, size=(height, width), colors=1 << 24)
+        self.output = []
+
+    def _write(self, text):
+        self.output.append(text)
+
+    def resize(self, height, width):
+        self.fixed_size = (height, width)
+        self.height, self.width = height, width
+        self.erase()
+
+    def take(self):
+        """Return and forget everything written since the last call"""
+        text = "".join(self.output)
+        self.output = []
+        return text
+
+
+# 3x5 bitmaps for the large-digit timer, one row string per pixel row
+BIG_FONT = {
+    "0": ("###", "#.#", "#.#", "#.#", "###"),
+    "1": (".#.", "##.", ".#.", ".#.", "###"),
+    "2": ("###", "..#", "###", "#..", "###"),
+    "3": ("###", "..#", "###", "..#", "###"),
+    "4": ("#.#", "#.#", "###", "..#", "..#"),
+    "5": ("###", "#..", "###", "..#", "###"),
+    "6": ("###", "#..", "###", "#.#", "###"),
+    "7": ("###", "..#", "..#", "..#", "..#"),
+    "8": ("###", "#.#", "###", "#.#", "###"),
+    "9": ("###", "#.#", "###", "..#", "###"),
+    ":": (".", "#", ".", "#", "."),
+}
+
+# Braille dot bit for pixel (x, y) inside a 2x4 cell
+BRAILLE_DOTS = ((0x01, 0x08), (0x02, 0x10), (0x04, 0x20), (0x40, 0x80))
+
+
+class DigitAtlas:
+    """Large-digit glyphs rasterized once into rows of terminal cells
+
+    block and ascii draw every font pixel as two cells ("██" or "##"), so the
+    digits come out roughly square; braille packs 2x4 pixels into each cell
+    for a compact two-row timer.
+    """
+
+    STYLES = ("block", "braille", "ascii")
+    GAP = 1  # Blank columns between glyphs
+
+    def __init__(self, style="block"):
+        self.style = style
+        self.glyphs = {ch: self._rasterize(bitmap) for ch, bitmap in BIG_FONT.items()}
+        self.height = len(self.glyphs["0"])
+
+    def _rasterize(self, bitmap):
+        if self.style == "braille":
+            rows = []
+            for cell_y in range(0, len(bitmap), 4):
+                row = ""
+                for cell_x in range(0, len(bitmap[0]), 2):
+                    dots = 0
+                    for dy in range(4):
+                        for dx in range(2):
+                            y, x = cell_y + dy, cell_x + dx
+                            if y < len(bitmap) and x < len(bitmap[0]) and bitmap[y][x] == "#":
+                                dots |= BRAILLE_DOTS[dy][dx]
+                    row += chr(0x2800 + dots) if dots else " "
+                rows.append(row)
+            return rows
+        pixel = BLOCK_CURSOR if self.style == "block" else "#"
+        return ["".join(pixel * 2 if bit == "#" else "  " for bit in row) for row in bitmap]
+
+    def glyph_set(self):
+        return {ch for rows in self.glyphs.values() for row in rows for ch in row} - {" "}
+
+    def offsets(self, text):
+        """Column offset of each character of text, and the total width"""
+        offsets = []
+        x = 0
+        for ch in text:
+            offsets.append(x)
+            x += len(self.glyphs[ch][0]) + self.GAP
+        return offsets, x - self.GAP
+
+    @classmethod
+    def for_glyphs(cls, style, glyph_groups):
+        """The requested style if the terminal can draw it, else the next one that can
+
+        "auto" tries block, braille and ascii in that order.
+        """
+        working = set(get_safe_symbols(None, glyph_groups)) | set(glyph_groups.get("cursor", []))
+        # Only a sample of the Braille block is probed; it ships as one font
+        # range, so any working pattern vouches for the others
+        braille = any(len(ch) == 1 and 0x2800 <= ord(ch) <= 0x28FF for ch in working)
+        candidates = cls.STYLES if style == "auto" else cls.STYLES[cls.STYLES.index(style):]
+        for candidate in candidates:
+            atlas = cls(candidate)
+            if (candidate == "ascii" or (candidate == "braille" and braille) or
+                    atlas.glyph_set() <= working):
+                return atlas
+        return cls("ascii")
+
+
+class TimerSlot:
+    """One countdown on screen: its clock, optional label and current placement"""
+
+    def __init__(self, clock, label=""):
+        self.clock = clock
+        self.label = label
+        self.time_part = None
+        self.expired = False
+        self.display = False  # False when the slot's region is too small for the timer
+        self.big = False  # Drawn with large digits
+        self.cells = []  # Screen positions the timer occupies
+        self.label_cells = []
+        self.invalidate()
+
+    def invalidate(self):
+        """Forget what is on screen, so the next draw puts every segment"""
+        self.shown_spinner = None
+        self.shown_time = None
+        self.shown_cursor = None
+
+
+def grid_regions(count, height, width, cell_width=24, cell_height=5):
+    """Split the screen into count (top, left, bottom, right) regions, row by row
+
+    The column count is chosen so the smaller of the two axes has the most room
+    relative to the size a timer needs.
+    """
+    best = 1
+    best_fit = -1.0
+    for columns in range(1, count + 1):
+        rows = -(-count // columns)
+        fit = min((width // columns) / cell_width, (height // rows) / cell_height)
+        if fit > best_fit:
+            best, best_fit = columns, fit
+    columns = best
+    rows = -(-count // columns)
+
+    regions = []
+    for i in range(count):
+        row, column = divmod(i, columns)
+        top, bottom = row * height // rows, (row + 1) * height // rows - 1
+        left, right = column * width // columns, (column + 1) * width // columns - 1
+        regions.append((top, left, bottom, right))
+    return regions
+
+
+class MatrixCountdown:
+    """The countdown scene: matrix rain, spark/glitch particles and the timers
+
+    Draws through a FrameBuffer onto any screen backend (CursesScreen or
+    MemoryScreen); the caller owns pacing, input and resize detection. Given
+    several clocks it becomes a dashboard: each timer gets a grid region while
+    the rain, particle pool and symbol table stay shared, so adding a timer
+    only adds its own few cells per frame.
+    """
+
+    def __init__(self, screen, clocks, theme, glyph_groups, trail_length=1, max_particles=256,
+                 effects=True, profiler=None, labels=None, seed=None, big=None):
+        self.screen = screen
+        self.big = big  # Large-digit style ("auto", "block", "braille", "ascii") or None
+        self.random = RandomStream(seed)
+        if isinstance(clocks, CountdownClock):
+            clocks = [clocks]
+        labels = labels or [""] * len(clocks)
+        self.timers = [TimerSlot(clock, label) for clock, label in zip(clocks, labels)]
+        self.dashboard = len(self.timers) > 1
+        self.next_spawn_timer = 0
+        self.profiler = profiler or NullProfiler()
+        self.hud_cells = []
+        self.trail_length = trail_length
+        self.effects = effects
+        attrs = screen.init_styles(theme)
+        # A style whose attribute matches an earlier one is drawn as that one,
+        # so where the gradients fall back to 8 colors, stepping through them
+        # changes no cells
+        first = {}
+        canonical = [first.setdefault(attr, style) for style, attr in enumerate(attrs)]
+        self.fade_styles = canonical[STYLE_SPARK_FADE:STYLE_RAIN_SHADE]  # variant * ALPHA_BUCKETS + bucket
+        self._set_glyphs(glyph_groups)
+
+        # Initialize matrix state with denser rain
+        self.height, self.width = screen.size()
+        # Single-glyph rain falls at full speed; longer trails get per-column speeds
+        speed_range = (1.0, 1.0) if trail_length <= 1 else (0.3, 1.0)
+        self.rain = make_rain_engine(self.width, self.height, speed_range, self.random)
+        self.trails = RainTrails(len(self.rain.cols), trail_length, canonical)
+
+        # Only cells that change between frames are sent to the terminal
+        self.frame_buffer = FrameBuffer(self.height, self.width, attrs)
+        self.effects_buffer = self.frame_buffer  # Where rain and particles draw
+        self.handoff = None  # Set while a simulation thread runs
+        self.sim_thread = None
+        self.lock = threading.RLock()  # Guards the simulation state against resizes
+
+        # Initialize particle system
+        self.particles = ParticlePool(max_particles)
+        self.last_particle_spawn = time.monotonic()
+
+        # Output limits, lowered by a BandwidthGovernor on slow links
+        self.rain_stride = 1  # Draw every Nth rain column; 0 turns the rain off
+        self.particle_limit = max_particles
+        self.output_budget = None  # Estimated bytes per flush
+        self.priority_cells = []  # Timer cells flushed ahead of everything else
+
+        self.times_up_messages = ["✓ TIME'S UP! ✓", "TIME'S UP!"]
+        self.times_up_positions = {}
+
+        self.si = 0
+        self.cursor_visible = True
+        self.last_toggle = time.monotonic()
+        self._layout()
+
+    def _set_glyphs(self, glyph_groups):
+        # Measure the spinner and cursor chars the terminal can show
+        (self.spinner_frames, self.frame_width,
+         self.block_cursor, self.cursor_width) = test_and_measure_chars(None, glyph_groups)
+        self.spinner_widths = [safe_wcswidth(f) or 1 for f in self.spinner_frames]
+
+        # Get safe symbols by actually testing them in the current terminal
+        symbols = get_safe_symbols(None, glyph_groups)
+        if not symbols:  # Ultimate fallback
+            symbols = ["|", ":", ".", "*", "#", "+", "-", "="]
+
+        # Compile the rain symbols into lookup arrays for the hot loop
+        self.symbol_table = SymbolTable(symbols)
+
+        # Particle-specific symbols (sparks and glitches) that work
+        self.working_sparks = list(glyph_groups.get("sparks", [])) or ["*", ".", "+"]
+        self.working_glitches = list(glyph_groups.get("glitches", [])) or ["#", "@", "?"]
+
+        # Large digits are rasterized once from the glyphs that work
+        self.atlas = DigitAtlas.for_glyphs(self.big, glyph_groups) if self.big else None
+
+    def set_glyph_groups(self, glyph_groups):
+        """Switch to newly probed glyphs, e.g. once startup has finished with Tier 1"""
+        with self.lock:
+            self._clear_timers()
+            self._set_glyphs(glyph_groups)
+            self._layout()
+
+    def set_clocks(self, clocks, labels=None):
+        """Replace the countdowns, e.g. when a daemon adds or cancels one; the rain keeps running"""
+        with self.lock:
+            self._clear_timers()
+            labels = labels or [""] * len(clocks)
+            self.timers = [TimerSlot(clock, label) for clock, label in zip(clocks, labels)]
+            self.dashboard = len(self.timers) > 1
+            self._layout()
+
+    def redraw(self):
+        """Send every cell again on the next flush, e.g. after a notice covered the scene"""
+        with self.lock:
+            self.screen.erase()
+            self.frame_buffer.resize(self.height, self.width)
+
+    def _clear_timers(self):
+        # Timers are about to be re-centred, so their old cells must go
+        frame_buffer = self.frame_buffer
+        for timer in self.timers:
+            timer.invalidate()
+            for pos in timer.cells:
+                frame_buffer.clear(pos)
+            for pos in timer.label_cells:
+                frame_buffer.clear(pos)
+            timer.label_cells = []
+
+    def resize(self, height, width):
+        """Remap the running scene onto a new geometry instead of starting it over"""
+        with self.lock:
+            if self.handoff is not None:
+                # Land pending simulation output while positions still mean the old grid
+                self.frame_buffer.apply(self.handoff.take())
+                self.frame_buffer.apply(self.effects_buffer.take_changes())
+            self._resize(height, width)
+
+    def _resize(self, height, width):
+        frame_buffer = self.frame_buffer
+        self._clear_timers()
+        for pos in self.hud_cells:
+            frame_buffer.clear(pos)
+        self.hud_cells = []
+
+        self.height, self.width = height, width
+        old_width = frame_buffer.resize(height, width)
+        effects_buffer = self.effects_buffer
+        if effects_buffer is not frame_buffer:
+            # The simulation's grid is a copy of the frame buffer's, never remapped on its own
+            effects_buffer.resize(height, width)
+            effects_buffer.cells = dict(frame_buffer.cells)
+        self.rain.resize(width, height)
+        self.trails.resize(len(self.rain.cols), effects_buffer, old_width)
+        self.particles.relocate_cells(effects_buffer, old_width)
+        self.screen.erase()
+        self._layout()
+
+    def _layout(self):
+        """Place the timers for the current geometry and rebuild the occupancy mask"""
+        height, width = self.height, self.width
+
+        # Nothing is drawn in the last column, so wide glyphs never wrap
+        mask = OccupancyMask(height, width)
+        mask.reserve(0, width - 1, height - 1, width - 1)
+
+        regions = grid_regions(len(self.timers), height, width) if self.dashboard else [(0, 0, height - 1, width - 1)]
+        priority_cells = []
+        for timer, region in zip(self.timers, regions):
+            self._place_timer(timer, region)
+            if timer.display:
+                mask.reserve(timer.safe_top, timer.safe_left, timer.safe_bottom, timer.safe_right)
+                priority_cells.extend(timer.cells)
+            timer.label_cells = []
+        self.priority_cells = priority_cells
+
+        # Keep rain and particles out from under the profiling HUD
+        self.hud_reserved = self.profiler.hud_visible
+        if self.hud_reserved:
+            mask.reserve(0, 0, FrameProfiler.HUD_HEIGHT - 1, FrameProfiler.HUD_WIDTH - 1)
+
+        self.mask = mask
+        effects_buffer = self.effects_buffer
+        self.trails.release_masked(mask, effects_buffer)
+        self.particles.release_masked(mask, effects_buffer)
+        if effects_buffer is not self.frame_buffer:
+            # Land those clears now: published by the simulation thread, they
+            # would arrive after the timers are drawn and erase their cells
+            self.frame_buffer.apply(effects_buffer.take_changes())
+
+    def _place_timer(self, timer, region):
+        """Centre one timer (and its label row, on a dashboard or when labelled) inside region"""
+        top, left, bottom, right = region
+        region_width = right - left + 1
+        label_rows = 1 if self.dashboard or timer.label else 0
+        if self.atlas is not None and self._place_big_timer(timer, region, label_rows):
+            return
+        timer.big = False
 
         # Calculate positions for each component
+        frame_width, cursor_width = self.frame_width, self.cursor_width
         time_width = 8  # "01:39:54" is always 8 chars
         total_display_width = frame_width + 1 + time_width + 1 + cursor_width
 
         # Center the whole thing
-        start_x = max(0, (width - total_display_width) // 2)
+        start_x = left + max(0, (region_width - total_display_width) // 2)
 
         # Calculate each component position
-        frame_x = start_x
-        time_x = frame_x + frame_width + 1  # frame + space
-        cursor_x = time_x + time_width + 1  # time + space
+        timer.frame_x = start_x
+        timer.time_x = timer.frame_x + frame_width + 1  # frame + space
+        timer.cursor_x = timer.time_x + time_width + 1  # time + space
 
         # Ensure countdown fits on screen
-        clock_y = max(0, min(height - 1, height // 2))
+        timer.clock_y = max(top, min(bottom, top + (bottom - top + 1) // 2))
 
         # Define safe area around countdown (use actual positions)
-        if total_display_width <= width - 4:
+        timer.display = (total_display_width <= region_width - 4 and
+                         timer.clock_y - label_rows >= top)
+        if timer.display:
             pad_y = 1
             pad_x = 3
-            safe_top = max(0, clock_y - pad_y)
-            safe_bottom = min(height - 1, clock_y + pad_y)
-            safe_left = max(0, start_x - pad_x)
-            safe_right = min(width - 1, cursor_x + cursor_width + pad_x)
-            display_timer = True
-
-            # Spawn particles around the countdown
-            current_time = time.time()
-            if current_time - last_particle_spawn >= 0.1:  # Spawn every 100ms
-                # Calculate intensity based on remaining time
-                total_minutes = remaining.total_seconds() / 60
-                if total_minutes <= 60:  # More intense in last hour
-                    intensity = max(1, int(6 - (total_minutes / 10)))  # 1-6 particles
-                elif total_minutes <= 300:  # Moderate in last 5 hours
-                    intensity = max(1, int(3 - (total_minutes / 100)))  # 1-3 particles
-                else:
-                    intensity = 1  # Minimal particles for longer countdowns
-
-                # Determine particle type based on urgency
-                if total_minutes <= 5:  # Last 5 minutes - urgent glitches
-                    particle_type = "urgent_glitch"
-                elif total_minutes <= 30:  # Last 30 minutes - mixed
-                    particle_type = random.choice(["spark", "glitch"])
-                else:  # Normal sparks
-                    particle_type = "spark"
-
-                # Spawn particles around countdown area
-                for _ in range(intensity):
-                    # Random position around countdown (not directly on it)
-                    if random.choice([True, False]):  # Spawn on sides
-                        px = random.choice([
-                            random.randint(max(0, safe_left - 5), safe_left),  # Left side
-                            random.randint(safe_right, min(width - 1, safe_right + 5))  # Right side
-                        ])
-                        py = random.randint(safe_top, safe_bottom)
-                    else:  # Spawn above/below
-                        px = random.randint(safe_left, safe_right)
-                        py = random.choice([
-                            random.randint(max(0, safe_top - 3), safe_top),  # Above
-                            random.randint(safe_bottom, min(height - 1, safe_bottom + 3))  # Below
-                        ])
-
-                    # Choose symbol and properties based on particle type
-                    if particle_type == "urgent_glitch":
-                        symbol = random.choice(working_glitches)
-                        lifetime = random.randint(8, 20)  # Longer lasting
-                        dx = random.choice([-1, 0, 1]) * 0.3
-                        dy = random.choice([-1, 0, 1]) * 0.3
-                        color_idx = random.choice([1, 2])  # Red/yellow for urgency
-                    elif particle_type == "glitch":
-                        symbol = random.choice(working_glitches)
-                        lifetime = random.randint(5, 15)
-                        dx = random.choice([-1, 0, 1]) * 0.2
-                        dy = random.choice([-1, 0, 1]) * 0.2
-                        color_idx = random.randint(0, len(spark_colors) - 1)
-                    else:  # spark
-                        symbol = random.choice(working_sparks)
-                        lifetime = random.randint(3, 12)
-                        dx = random.uniform(-0.5, 0.5)
-                        dy = random.uniform(-0.5, 0.5)
-                        color_idx = random.randint(0, len(spark_colors) - 1)
-
-                    # Ensure particle starts in bounds
-                    if 0 <= px < width - 1 and 0 <= py < height:
-                        particles.append(Particle(px, py, symbol, lifetime, dx, dy, color_idx))
-
-                last_particle_spawn = current_time
+            timer.safe_top = max(top, timer.clock_y - label_rows - pad_y)
+            timer.safe_bottom = min(bottom, timer.clock_y + pad_y)
+            timer.safe_left = max(left, start_x - pad_x)
+            timer.safe_right = min(right, timer.cursor_x + cursor_width + pad_x)
+            timer.label_width = region_width - 2
+            timer.label_x = left + 1
+            start = timer.clock_y * self.width
+            timer.cells = list(range(start + start_x, start + min(self.width, timer.cursor_x + cursor_width)))
         else:
             # Timer too wide, don't display it and don't create safe area
-            safe_top = safe_bottom = safe_left = safe_right = -1
-            display_timer = False
-
-        try:
-            stdscr.erase()
-        except curses.error:
-            pass
-
-        # Update and render particles
-        active_particles = []
-        for particle in particles:
-            if particle.update():  # Returns True if particle is still alive
-                # Calculate display position
-                display_x = int(particle.x)
-                display_y = int(particle.y)
-
-                # Only render if in bounds and not overlapping countdown
-                if (0 <= display_x < width - 1 and 0 <= display_y < height and
-                        not (safe_left <= display_x <= safe_right and safe_top <= display_y <= safe_bottom)):
-
-                    try:
-                        # Choose color based on particle's color variant and alpha
-                        alpha = particle.get_alpha()
-                        if alpha > 0.7:  # Bright particles
-                            color = spark_colors[particle.color_variant % len(spark_colors)]
-                        elif alpha > 0.3:  # Medium particles
-                            color = spark_colors[particle.color_variant % len(spark_colors)]
-                        else:  # Fading particles
-                            color = matrix_color  # Use theme's matrix color for fading
-
-                        stdscr.addstr(display_y, display_x, particle.symbol, color)
-                    except (curses.error, UnicodeEncodeError):
-                        pass  # Skip particles that can't be drawn
-
-                active_particles.append(particle)
-
-        particles = active_particles  # Keep only active particles
-
-        # Draw matrix rain with comprehensive fallback handling
-        for i, col in enumerate(cols):
-            if i >= len(drops):
-                continue
+            timer.safe_top = timer.safe_bottom = timer.safe_left = timer.safe_right = -1
+            timer.cells = []
+
+    def _place_big_timer(self, timer, region, label_rows):
+        """Centre the large-digit timer in region; False if it does not fit there"""
+        top, left, bottom, right = region
+        region_width, region_height = right - left + 1, bottom - top + 1
+        atlas = self.atlas
+        offsets, big_width = atlas.offsets("00:00:00")
+        if big_width > region_width - 4 or atlas.height + label_rows > region_height:
+            return False
 
-            drop_y = drops[i]
-            row = drop_y % height
-
-            # Skip countdown safe area and check bounds
-            if (not (safe_left <= col <= safe_right and safe_top <= row <= safe_bottom) and
-                    0 <= row < height and 0 <= col < width - 2):  # Extra margin for wide chars
-
-                # Try to use a random symbol with fallback chain
-                for attempt in range(3):  # Try up to 3 different symbols
-                    try:
-                        ch = random.choice(symbols)
-                        ch_width = safe_wcswidth(ch)
-                        if ch_width is not None and col + ch_width <= width:
-                            stdscr.addstr(row, col, ch, matrix_color)  # Use theme's matrix color
-                            break  # Success, exit fallback loop
-                    except (curses.error, UnicodeEncodeError):
-                        if attempt == 2:  # Last attempt, use basic fallback
-                            try:
-                                stdscr.addstr(row, col, "|", matrix_color)  # Use theme's matrix color
-                            except curses.error:
-                                pass
-
-            drops[i] = drop_y + 1
-            # Make drops restart more frequently for denser effect
-            if drops[i] > height + random.randint(0, height // 4):  # Changed from height//2 to height//4
-                drops[i] = random.randint(-height // 4, 0)  # Shorter gaps between drops
-
-        # Draw the countdown by placing each component separately
-        if display_timer:
-            try:
-                # Clear the entire area first
-                clear_width = cursor_x + cursor_width - frame_x
-                if frame_x + clear_width <= width:
-                    clear_text = " " * clear_width
-                    stdscr.addstr(clock_y, frame_x, clear_text)
+        timer.big = True
+        timer.display = True
+        timer.big_offsets = offsets
+        timer.frame_x = left + (region_width - big_width) // 2
+        timer.clock_y = top + label_rows + (region_height - label_rows - atlas.height) // 2
+
+        # The safe area grows to cover every row of the digits
+        pad_y = 1
+        pad_x = 3
+        timer.safe_top = max(top, timer.clock_y - label_rows - pad_y)
+        timer.safe_bottom = min(bottom, timer.clock_y + atlas.height - 1 + pad_y)
+        timer.safe_left = max(left, timer.frame_x - pad_x)
+        timer.safe_right = min(right, timer.frame_x + big_width - 1 + pad_x)
+        timer.label_width = region_width - 2
+        timer.label_x = left + 1
+        timer.cells = [(timer.clock_y + row) * self.width + timer.frame_x + x
+                       for row in range(atlas.height) for x in range(big_width)]
+        return True
 
-                # Draw each component at its exact position
-                if frame_x + frame_width <= width:
-                    stdscr.addstr(clock_y, frame_x, frame, color_pair)
+    def render_frame(self, now=None):
+        """Simulate and draw one frame; returns False once every countdown is over"""
+        now = time.monotonic() if now is None else now
+        timers = self.timers
+        live = 0
+        for timer in timers:
+            if not timer.expired and timer.clock.remaining() <= 0:
+                timer.expired = True
+                timer.time_part = "00:00:00"
+                timer.label_cells = self._draw_label(timer, timer.label_cells)
+            live += not timer.expired
+        if not live:
+            return False
 
-                if time_x + time_width <= width:
-                    stdscr.addstr(clock_y, time_x, time_part, color_pair)
+        # Toggle blinking cursor
+        if now - self.last_toggle >= 0.5:
+            self.cursor_visible = not self.cursor_visible
+            self.last_toggle = now
+
+        # Digits are only rebuilt when the displayed second changes
+        for timer in timers:
+            if not timer.expired and timer.clock.tick():
+                h, m, s = timer.clock.remaining_hms()
+                timer.time_part = f"{h:02d}:{m:02d}:{s:02d}"
+
+        profiler = self.profiler
+        if profiler.hud_visible != self.hud_reserved:
+            with self.lock:
+                self._layout()
+        profiler.mark("timer")
+
+        if self.handoff is None:
+            self._step_effects(now, profiler)
+        else:
+            # The simulation thread already stepped; take whatever it produced
+            self.frame_buffer.apply(self.handoff.take())
+            profiler.mark("rain")
+
+        # Draw each countdown; only segments that changed are put
+        spinner = self.si % len(self.spinner_frames)
+        for timer in timers:
+            if not timer.display:
+                continue
+            if (self.dashboard or timer.label) and not timer.label_cells:
+                timer.label_cells = self._draw_label(timer, [])
+            if timer.expired:
+                self._draw_timer(timer, -1, False)
+            else:
+                self._draw_timer(timer, spinner, self.cursor_visible)
+        self.si += 1
+
+        if self.hud_cells or profiler.hud_visible:
+            self._draw_hud()
+        profiler.mark("timer")
+
+        self.frame_buffer.flush(self.screen, self.output_budget, self.priority_cells)
+        profiler.mark("flush")
+        self.screen.refresh()
+        profiler.mark("refresh")
+        return True
 
-                if cursor_x + cursor_width <= width:
-                    stdscr.addstr(clock_y, cursor_x, cursor, color_pair)
+    def _step_effects(self, now, profiler):
+        """Spawn, move and draw particles and rain into the effects buffer"""
+        # Spawn particles around one running countdown at a time, so the spawn
+        # rate does not grow with the number of timers
+        timers = self.timers
+        if self.effects and now - self.last_particle_spawn >= 0.1:  # Spawn every 100ms
+            for _ in range(len(timers)):
+                timer = timers[self.next_spawn_timer % len(timers)]
+                self.next_spawn_timer += 1
+                if timer.display and not timer.expired:
+                    self._spawn_particles(timer, timer.clock.remaining())
+                    break
+            self.last_particle_spawn = now
+        profiler.mark("particle_spawn")
+
+        self._update_particles()
+        profiler.mark("particle_update")
+        if self.effects:
+            self._update_rain()
+        profiler.mark("rain")
+
+    def start_simulation(self, scheduler):
+        """Move rain and particle stepping onto a thread paced by scheduler's interval
+
+        render_frame() then only applies the latest published changes and draws
+        the timers from their clocks, so a blocking terminal write can neither
+        stall the animation nor delay the timer.
+        """
+        if self.sim_thread is not None or not self.effects:
+            return
+        with self.lock:
+            recording = RecordingFrameBuffer(self.height, self.width)
+            recording.cells = dict(self.frame_buffer.cells)  # So clears of drawn cells are recorded
+            self.effects_buffer = recording
+            self.handoff = FrameHandoff()
+        self.sim_stop = threading.Event()
+        self.sim_thread = threading.Thread(target=self._simulate, args=(scheduler,),
+                                           name="countdown-sim", daemon=True)
+        self.sim_thread.start()
+
+    def stop_simulation(self):
+        if self.sim_thread is None:
+            return
+        self.sim_stop.set()
+        self.sim_thread.join()
+        self.sim_thread = None
+        with self.lock:
+            # Draw in place again, after landing what the thread left behind:
+            # the last published frame and anything recorded since
+            self.frame_buffer.apply(self.handoff.take())
+            self.frame_buffer.apply(self.effects_buffer.take_changes())
+            self.effects_buffer = self.frame_buffer
+            self.handoff = None
+
+    def _simulate(self, scheduler):
+        profiler = NullProfiler()  # The profiler belongs to the curses thread
+        next_frame = time.monotonic()
+        while not self.sim_stop.is_set():
+            # Published under the lock, so a resize never receives a frame
+            # meant for the old geometry after it has drained the handoff
+            with self.lock:
+                self._step_effects(time.monotonic(), profiler)
+                self.handoff.publish(self.effects_buffer.take_changes())
+
+            next_frame += scheduler.interval
+            delay = next_frame - time.monotonic()
+            if delay < 0:
+                next_frame = time.monotonic()  # Behind; resync instead of bursting
+            self.sim_stop.wait(max(0.0, delay))
+
+    def _draw_timer(self, timer, spinner, cursor_visible):
+        """Put the timer segments that differ from what the slot last drew
+
+        The slot's position is cached per geometry by _place_timer(), so a
+        typical frame touches only the spinner and, once a second, the digits
+        that changed. spinner is a frame index, or -1 to blank it.
+        """
+        frame_buffer = self.frame_buffer
+        y = timer.clock_y
+        if timer.big:
+            self._draw_big_timer(timer)
+            return
+
+        if spinner != timer.shown_spinner:
+            # Place the glyph at its exact position and blank only the gap after
+            # it, so no cell covered by a wide spinner glyph is written separately
+            frame_width = self.frame_width
+            if spinner < 0:
+                frame_buffer.put_text(y, timer.frame_x, " " * (frame_width + 1), STYLE_TIMER)
+            else:
+                spinner_width = self.spinner_widths[spinner]
+                frame_buffer.put(y, timer.frame_x, self.spinner_frames[spinner], STYLE_TIMER, spinner_width)
+                if timer.shown_spinner is None or spinner_width != self.spinner_widths[timer.shown_spinner]:
+                    frame_buffer.put_text(y, timer.frame_x + spinner_width,
+                                          " " * (frame_width - spinner_width + 1), STYLE_TIMER)
+            timer.shown_spinner = spinner
+
+        text, shown = timer.time_part, timer.shown_time
+        if text != shown:
+            if shown is None or len(shown) != len(text):
+                frame_buffer.put_text(y, timer.time_x, text + " ", STYLE_TIMER)
+            else:
+                for i, ch in enumerate(text):
+                    if ch != shown[i]:
+                        frame_buffer.put(y, timer.time_x + i, ch, STYLE_TIMER)
+            timer.shown_time = text
+
+        if cursor_visible != timer.shown_cursor:
+            if cursor_visible:
+                frame_buffer.put(y, timer.cursor_x, self.block_cursor, STYLE_TIMER, self.cursor_width)
+            else:
+                frame_buffer.put_text(y, timer.cursor_x, " " * self.cursor_width, STYLE_TIMER)
+            timer.shown_cursor = cursor_visible
+
+    def _draw_big_timer(self, timer):
+        # Repaint only the large digits whose character changed
+        text, shown = timer.time_part, timer.shown_time
+        if text == shown:
+            return
+        frame_buffer, glyphs = self.frame_buffer, self.atlas.glyphs
+        for i, ch in enumerate(text[:len(timer.big_offsets)]):
+            if shown is not None and i < len(shown) and shown[i] == ch:
+                continue
+            x = timer.frame_x + timer.big_offsets[i]
+            for row, cells in enumerate(glyphs.get(ch, glyphs[":"])):
+                frame_buffer.put_text(timer.clock_y + row, x, cells, STYLE_TIMER)
+        timer.shown_time = text
+
+    def _draw_label(self, timer, old_cells):
+        """Centre the timer's label (or TIME'S UP) on the row above it; returns its cells"""
+        frame_buffer = self.frame_buffer
+        for pos in old_cells:
+            frame_buffer.clear(pos)
+        if not ((self.dashboard or timer.label) and timer.display):
+            return []
+        text = "TIME'S UP!" if timer.expired else timer.label
+        glyphs = []
+        text_width = 0
+        for ch in text:
+            ch_width = safe_wcswidth(ch)
+            if ch_width <= 0 or text_width + ch_width > timer.label_width:
+                continue
+            glyphs.append((ch, ch_width))
+            text_width += ch_width
+
+        y = timer.clock_y - 1
+        x = timer.label_x + (timer.label_width - text_width) // 2
+        cells = []
+        for ch, ch_width in glyphs:
+            cells.append(frame_buffer.put(y, x, ch, STYLE_TIMER, ch_width))
+            x += ch_width
+        return cells
+
+    def _draw_hud(self):
+        # Drawn last so it sits on top of the rain; cells re-put unchanged cost nothing
+        frame_buffer = self.frame_buffer
+        for pos in self.hud_cells:
+            frame_buffer.clear(pos)
+        self.hud_cells = []
+        for y, line in enumerate(self.profiler.hud_lines()[:self.height]):
+            line = line[:self.width - 1]
+            frame_buffer.put_text(y, 0, line, STYLE_TIMER)
+            start = frame_buffer.pos(y, 0)
+            self.hud_cells.extend(range(start, start + len(line)))
+
+    def _spawn_particles(self, timer, remaining):
+        height, width = self.height, self.width
+        safe_top, safe_bottom = timer.safe_top, timer.safe_bottom
+        safe_left, safe_right = timer.safe_left, timer.safe_right
+        rand = self.random
+
+        # Calculate intensity based on remaining time
+        total_minutes = remaining / 60
+        if total_minutes <= 60:  # More intense in last hour
+            intensity = max(1, int(6 - (total_minutes / 10)))  # 1-6 particles
+        elif total_minutes <= 300:  # Moderate in last 5 hours
+            intensity = max(1, int(3 - (total_minutes / 100)))  # 1-3 particles
+        else:
+            intensity = 1  # Minimal particles for longer countdowns
+
+        # Determine particle type based on urgency
+        if total_minutes <= 5:  # Last 5 minutes - urgent glitches
+            particle_type = "urgent_glitch"
+        elif total_minutes <= 30:  # Last 30 minutes - mixed
+            particle_type = "spark" if rand.random() < 0.5 else "glitch"
+        else:  # Normal sparks
+            particle_type = "spark"
+
+        # Spawn particles around countdown area
+        for _ in range(intensity):
+            if self.particles.count >= self.particle_limit:
+                break
+            # Random position around countdown (not directly on it)
+            if rand.random() < 0.5:  # Spawn on sides
+                if rand.random() < 0.5:
+                    px = rand.randint(max(0, safe_left - 5), safe_left)  # Left side
+                else:
+                    px = rand.randint(safe_right, min(width - 1, safe_right + 5))  # Right side
+                py = rand.randint(safe_top, safe_bottom)
+            else:  # Spawn above/below
+                px = rand.randint(safe_left, safe_right)
+                if rand.random() < 0.5:
+                    py = rand.randint(max(0, safe_top - 3), safe_top)  # Above
+                else:
+                    py = rand.randint(safe_bottom, min(height - 1, safe_bottom + 3))  # Below
+
+            # Choose symbol and properties based on particle type
+            if particle_type == "urgent_glitch":
+                symbol = rand.choice(self.working_glitches)
+                lifetime = rand.randint(8, 20)  # Longer lasting
+                dx = (rand.below(3) - 1) * 0.3  # -1, 0 or 1 step
+                dy = (rand.below(3) - 1) * 0.3
+                color_idx = 1 + rand.below(2)  # Red/yellow for urgency
+            elif particle_type == "glitch":
+                symbol = rand.choice(self.working_glitches)
+                lifetime = rand.randint(5, 15)
+                dx = (rand.below(3) - 1) * 0.2
+                dy = (rand.below(3) - 1) * 0.2
+                color_idx = rand.below(SPARK_STYLES)
+            else:  # spark
+                symbol = rand.choice(self.working_sparks)
+                lifetime = rand.randint(3, 12)
+                dx = rand.uniform(-0.5, 0.5)
+                dy = rand.uniform(-0.5, 0.5)
+                color_idx = rand.below(SPARK_STYLES)
+
+            # Ensure particle starts in bounds
+            if 0 <= px < width - 1 and 0 <= py < height:
+                self.particles.spawn(px, py, symbol, lifetime, dx, dy, color_idx)
+
+    def _update_particles(self):
+        """Update and render particles in place"""
+        height, width = self.height, self.width
+        blocked = self.mask.cells
+        frame_buffer, particles = self.effects_buffer, self.particles
+        p_x, p_y, p_dx, p_dy = particles.x, particles.y, particles.dx, particles.dy
+        p_life, p_max_life, p_cell = particles.lifetime, particles.max_lifetime, particles.cell
+        fade_styles = self.fade_styles
+
+        i = 0
+        while i < particles.count:
+            # Particles move every frame, so the previous cell is always released
+            if p_cell[i] >= 0:
+                frame_buffer.clear(p_cell[i])
+                p_cell[i] = -1
+
+            p_life[i] -= 1
+            if p_life[i] <= 0:
+                particles.kill(i)  # The last particle moves into slot i; revisit it
+                continue
 
+            p_x[i] += p_dx[i]
+            p_y[i] += p_dy[i]
+            display_x = int(p_x[i])
+            display_y = int(p_y[i])
+
+            # Only render if on screen and not in a reserved region
+            if 0 <= display_x < width and 0 <= display_y < height and not blocked[display_y * width + display_x]:
+
+                # The share of lifetime left picks the fade step, 0 the dimmest
+                bucket = (p_life[i] * ALPHA_BUCKETS - 1) // p_max_life[i]
+                style = fade_styles[particles.color_variant[i] * ALPHA_BUCKETS + bucket]
+                p_cell[i] = frame_buffer.put(display_y, display_x, particles.symbol[i], style)
+            i += 1
+
+    def _update_rain(self):
+        """Advance matrix rain; only columns whose head entered a new row touch any cells"""
+        height, width = self.height, self.width
+        blocked = self.mask.cells
+        frame_buffer, trails, cols = self.effects_buffer, self.trails, self.rain.cols
+        symbol_table = self.symbol_table
+        rain_glyphs, rain_widths, narrow_glyphs = symbol_table.glyphs, symbol_table.widths, symbol_table.narrow
+        glyph_count, narrow_count = len(rain_glyphs), len(narrow_glyphs)
+
+        rain_stride = self.rain_stride
+
+        # One bulk draw covers every glyph pick this frame
+        moved = self.rain.step()
+        picks = self.random.indices(glyph_count, len(moved))
+        for (i, row), idx in zip(moved, picks):
+            col = cols[i]
+
+            # Skip reserved regions, cells off screen (the rain keeps two
+            # columns even when the terminal is narrower) and columns thinned
+            # out for bandwidth
+            if (0 <= row < height and col < width and not blocked[row * width + col] and
+                    rain_stride and i % rain_stride == 0):
+
+                # Pick by index; wide glyphs that would overflow the edge use the narrow subset
+                ch, ch_width = rain_glyphs[idx], rain_widths[idx]
+                if col + ch_width > width:
+                    ch, ch_width = narrow_glyphs[self.random.below(narrow_count)], 1
+                trails.advance(frame_buffer, i, row, col, ch, ch_width)
+            else:
+                trails.advance(frame_buffer, i, None, col, None, 1)
+
+    def draw_times_up(self):
+        """Replace the scene with the end-of-countdown message"""
+        self.times_up_messages = self.draw_notice(self.times_up_messages)
+
+    def draw_notice(self, messages):
+        """Replace the scene with the first of messages the terminal can show
+
+        Returns messages from that one on, so a fallback is not retried.
+        """
+        screen = self.screen
+        attr = self.frame_buffer.attrs[STYLE_TIMER]
+        screen.erase()
+        while messages:
+            msg = messages[0]
+            y, x = self._times_up_position(msg)
+            try:
+                screen.addstr(y, x, msg, attr)
+                if self.frame_buffer.recorder is not None:
+                    self.frame_buffer.recorder.message(y, x, msg, STYLE_TIMER)
+                break
             except (curses.error, UnicodeEncodeError):
-                # Fallback to basic ASCII countdown
+                # Fallback without checkmarks, and don't try the fancy one again
+                messages = messages[1:]
+        screen.refresh()
+        return messages
+
+    def _times_up_position(self, msg):
+        """Centre msg; positions are cached per message and geometry"""
+        height, width = self.height, self.width
+        key = (msg, height, width)
+        position = self.times_up_positions.get(key)
+        if position is None:
+            msg_width = safe_wcswidth(msg)
+            x = max(0, min(width - msg_width, (width - msg_width) // 2))
+            y = max(0, min(height - 1, height // 2))
+            position = self.times_up_positions[key] = (y, x)
+        return position
+
+
+def countdown_matrix(stdscr, targets, theme, reprobe=False, trail_length=1, max_particles=256,
+                     scheduler=None, effects=True, profiler=None, threaded=False, seed=None,
+                     governor=None, big=None, recorder=None, client=None, schedule=None):
+    """Run the countdown loop; targets is a list of (datetime, label) pairs
+
+    stdscr is a curses window, or an AnsiScreen when run through ansi_wrapper.
+    A SessionRecorder, if given, gets a copy of everything drawn. With a
+    DaemonClient the countdowns come from the daemon instead of targets, and
+    the loop keeps running after they end, waiting for new ones. With a
+    Schedule, the next deadline in it takes over as soon as one reaches zero.
+    """
+    screen = stdscr if isinstance(stdscr, AnsiScreen) else CursesScreen(stdscr)
+    scheduler = scheduler or FrameScheduler()
+    profiler = profiler or NullProfiler()
+    terminal_input = TerminalInput(screen, report_focus=scheduler.low_power_allowed)
+    scene = None
+    try:
+        # The first frame goes out with Tier 1 glyphs; the probed (or cached)
+        # groups are swapped in right after it, between frames
+        if client is not None:
+            client_version, timers = client.timers()
+            clocks, labels = [clock for clock, _ in timers], [label for _, label in timers]
+        else:
+            clocks, labels = [CountdownClock(target) for target, _ in targets], [label for _, label in targets]
+        scene = MatrixCountdown(screen, clocks, theme, basic_glyph_groups(), trail_length, max_particles,
+                                effects, profiler, labels=labels, seed=seed, big=big)
+        glyphs_loaded = False
+        notice_shown = False
+        if recorder is not None:
+            recorder.start(scene.height, scene.width)
+            scene.frame_buffer.recorder = recorder
+        if governor is not None:
+            governor.apply(scene, scheduler)
+        if threaded:
+            scene.start_simulation(scheduler)
+
+        scheduler.start()
+        while True:
+            profiler.start_frame()
+            current_time = time.monotonic()
+
+            # Idle when there is nothing to animate or nobody is looking
+            keys = terminal_input.poll()
+            scheduler.set_idle(not effects or not terminal_input.focused)
+            if ord("p") in keys:
+                profiler.toggle_hud()
+
+            # Resizes arrive as KEY_RESIZE, so the size is only queried when it changed
+            if terminal_input.resized:
+                new_height, new_width = screen.size()
+                if new_height != scene.height or new_width != scene.width:
+                    scene.resize(new_height, new_width)
+                    notice_shown = False
+            if client is not None:
+                if client.error is not None:
+                    raise ConnectionError(client.error)
+                if client.version != client_version:
+                    client_version, timers = client.timers()
+                    scene.set_clocks([clock for clock, _ in timers], [label for _, label in timers])
+                    if notice_shown:
+                        scene.redraw()
+                        notice_shown = False
+                        if threaded:
+                            scene.start_simulation(scheduler)
+            profiler.mark("input")
+
+            if not scene.render_frame(current_time):
+                upcoming = schedule.next_after(time.time()) if schedule is not None else None
+                if upcoming is not None:
+                    target, label = upcoming
+                    scene.set_clocks([CountdownClock(target)], [label])
+                    continue
+                scene.stop_simulation()
+                if client is None:
+                    scene.draw_times_up()
+                    time.sleep(3)
+                    break
+                # Nothing left to count down: hold the notice until the daemon sends more
+                if not notice_shown:
+                    if scene.timers:
+                        scene.draw_times_up()
+                    else:
+                        scene.draw_notice(["Waiting for countdowns..."])
+                    notice_shown = True
+                scheduler.wait()
+                continue
+            if not glyphs_loaded:
+                scene.set_glyph_groups(screen.glyph_groups(reprobe))
+                glyphs_loaded = True
+
+            if governor is not None:
+                frame_buffer = scene.frame_buffer
+                if governor.record(frame_buffer.frame_bytes, frame_buffer.frame_addstr_calls,
+                                   len(frame_buffer.dirty), scheduler.interval):
+                    governor.apply(scene, scheduler)
+
+            scheduler.wait()
+            profiler.mark("sleep")
+            frame_buffer = scene.frame_buffer
+            profiler.end_frame(scene.particles.count, frame_buffer.frame_addstr_calls,
+                               frame_buffer.frame_bytes)
+    finally:
+        if scene is not None:
+            scene.stop_simulation()
+        terminal_input.close()
+        profiler.close()
+
+
+def replay_session(stdscr, reader, theme, speed=1.0):
+    """Play a recording back at its recorded pace times speed; 'q' stops early"""
+    screen = stdscr if isinstance(stdscr, AnsiScreen) else CursesScreen(stdscr)
+    screen.nodelay(True)
+    player = SessionPlayer(screen, reader.header, theme)
+    start = time.monotonic()
+    for seconds, tag, fields in reader:
+        due = start + seconds / speed
+        while True:
+            key = screen.getch()
+            if key == ord("q"):
+                return
+            if key == curses.KEY_RESIZE:
+                player.redraw()
+            delay = due - time.monotonic()
+            if delay <= 0:
+                break
+            time.sleep(min(delay, 0.05))  # Stay responsive to keys on long gaps
+        player.apply(tag, fields)
+
+
+def export_asciicast(reader, theme, path):
+    """Convert a recording to an asciicast v2 file; returns the number of events written"""
+    header = reader.header
+    screen = CastScreen(header["height"], header["width"])
+    player = SessionPlayer(screen, header, theme)
+    events = 0
+    with open(path, "w", encoding="utf-8") as out:
+        out.write(json.dumps({"version": 2, "width": header["width"], "height": header["height"],
+                              "timestamp": int(header.get("started", time.time())),
+                              "env": {"TERM": "xterm-256color"}}) + "\n")
+        prefix = "\x1b[?25l"  # Hide the cursor, as the live run does
+        for seconds, tag, fields in reader:
+            seconds = round(seconds, 3)
+            if tag == RECORD_RESIZE:
+                height, width = fields
+                screen.resize(height, width)
+                out.write(json.dumps([seconds, "r", f"{width}x{height}"]) + "\n")
+                events += 1
+            player.apply(tag, fields)
+            text = screen.take()
+            if text:
+                out.write(json.dumps([seconds, "o", prefix + text], ensure_ascii=False) + "\n")
+                prefix = ""
+                events += 1
+    return events
+
+
+def default_socket_path():
+    """Where the daemon listens unless --socket says otherwise"""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "retro_countdown.sock")
+    return f"/tmp/retro_countdown-{os.getuid()}.sock"
+
+
+class CountdownDaemon:
+    """Owns the countdown targets and their clocks; serves clients over a Unix socket
+
+    Clients send one JSON command per line and get one JSON reply per line:
+    add, change, cancel, list and subscribe. Subscribers also get a tick event
+    every second, and one straight away whenever the targets change. A tick
+    is encoded once and the same bytes go to every subscriber, so a client
+    costs one buffered write per second. A client that stops reading is
+    dropped once MAX_BACKLOG bytes are queued for it.
+    """
+
+    TICK_INTERVAL = 1.0
+    EXPIRED_LINGER = 5.0  # Seconds an expired countdown stays listed, so clients show it end
+    MAX_BACKLOG = 64 * 1024
+
+    def __init__(self, path):
+        self.path = path
+        self.timers = {}  # id -> (CountdownClock, label)
+        self.next_id = 1
+        self.subscribers = set()
+
+    def add(self, target, label=""):
+        timer_id = self.next_id
+        self.next_id += 1
+        self.timers[timer_id] = (CountdownClock(target), label or target.strftime("%H:%M"))
+        return timer_id
+
+    def snapshot(self):
+        return [{"id": timer_id, "label": label, "target": clock.target.isoformat(),
+                 "remaining": round(clock.remaining(), 3)}
+                for timer_id, (clock, label) in sorted(self.timers.items())]
+
+    def command(self, request, writer):
+        """Carry out one client request; returns the reply"""
+        cmd = request.get("cmd")
+        if cmd == "add":
+            target = parse_target(request["target"])
+            return {"ok": True, "id": self.add(target, request.get("label", ""))}
+        if cmd in ("change", "cancel"):
+            timer_id = int(request["id"])
+            if timer_id not in self.timers:
+                return {"ok": False, "error": f"no countdown with id {timer_id}"}
+            if cmd == "cancel":
+                del self.timers[timer_id]
+            else:
+                clock, label = self.timers[timer_id]
+                if "target" in request:
+                    clock = CountdownClock(parse_target(request["target"]))
+                self.timers[timer_id] = (clock, request.get("label") or label)
+            return {"ok": True, "id": timer_id}
+        if cmd == "list":
+            return {"ok": True, "timers": self.snapshot()}
+        if cmd == "subscribe":
+            self.subscribers.add(writer)
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown command {cmd!r}"}
+
+    def tick_payload(self):
+        return (json.dumps({"event": "tick", "timers": self.snapshot()}) + "\n").encode("utf-8")
+
+    def broadcast(self):
+        payload = self.tick_payload()
+        for writer in list(self.subscribers):
+            if writer.transport.get_write_buffer_size() > self.MAX_BACKLOG:
+                self.subscribers.discard(writer)
+                writer.close()
+            else:
+                writer.write(payload)
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
                 try:
-                    fallback_text = f"TIME: {h:02d}:{m:02d}:{s:02d}"
-                    fallback_w = len(fallback_text)
-                    fallback_x = max(0, min(width - fallback_w, (width - fallback_w) // 2))
-                    if 0 <= clock_y < height and fallback_x + fallback_w <= width:
-                        stdscr.addstr(clock_y, fallback_x, fallback_text, color_pair)
-                except curses.error:
+                    request = json.loads(line)
+                    reply = self.command(request, writer)
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    reply = {"ok": False, "error": str(e) or type(e).__name__}
+                writer.write((json.dumps(reply) + "\n").encode("utf-8"))
+                if not reply["ok"] or request["cmd"] == "list":
+                    continue
+                if request["cmd"] == "subscribe":
+                    writer.write(self.tick_payload())  # No need to wait for the next second
+                else:
+                    self.broadcast()  # Every subscriber sees the change straight away
+        except (ConnectionError, asyncio.CancelledError):
+            pass  # Client gone, or the daemon is shutting down
+        finally:
+            self.subscribers.discard(writer)
+            writer.close()
+
+    def expire(self):
+        """Forget countdowns that ended more than EXPIRED_LINGER seconds ago"""
+        now = time.monotonic()
+        for timer_id, (clock, _) in list(self.timers.items()):
+            if clock.remaining() <= 0 and now - clock.deadline > self.EXPIRED_LINGER:
+                del self.timers[timer_id]
+
+    async def run(self):
+        if os.path.exists(self.path):
+            try:
+                _, writer = await asyncio.open_unix_connection(self.path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.unlink(self.path)  # Left behind by a daemon that did not exit cleanly
+            else:
+                writer.close()
+                raise OSError(f"a countdown daemon is already listening on {self.path}")
+        server = await asyncio.start_unix_server(self.handle, path=self.path)
+        os.chmod(self.path, 0o600)
+        stop = asyncio.Event()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+        try:
+            while not stop.is_set():
+                self.expire()
+                self.broadcast()
+                try:
+                    await asyncio.wait_for(stop.wait(), self.TICK_INTERVAL - time.monotonic() % self.TICK_INTERVAL)
+                except asyncio.TimeoutError:
                     pass
+        finally:
+            server.close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
 
+async def send_command(path, request):
+    """Send one request to the daemon and return its reply"""
+    reader, writer = await asyncio.open_unix_connection(path)
+    try:
+        writer.write((json.dumps(request) + "\n").encode("utf-8"))
+        line = await reader.readline()
+    finally:
+        writer.close()
+    if not line:
+        raise ConnectionError("the daemon closed the connection")
+    return json.loads(line)
+
+
+def ctl_request(words):
+    """Turn --ctl words into a daemon request; raises ValueError with the usage"""
+    cmd, args = words[0], words[1:]
+    if cmd == "add" and args:
+        return {"cmd": "add", "target": args[0], "label": " ".join(args[1:])}
+    if cmd == "change" and len(args) >= 2 and args[0].isdigit():
+        return {"cmd": "change", "id": int(args[0]), "target": args[1], "label": " ".join(args[2:])}
+    if cmd == "cancel" and len(args) == 1 and args[0].isdigit():
+        return {"cmd": "cancel", "id": int(args[0])}
+    if cmd == "list" and not args:
+        return {"cmd": "list"}
+    raise ValueError("--ctl takes: add TIME [LABEL], change ID TIME [LABEL], cancel ID or list")
+
+
+async def attach_plain(path):
+    """Print the daemon's countdowns as one text line per tick"""
+    reader, writer = await asyncio.open_unix_connection(path)
+    writer.write(b'{"cmd": "subscribe"}\n')
+    shown = None
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("the daemon closed the connection")
+            message = json.loads(line)
+            if message.get("event") != "tick":
+                continue
+            parts = []
+            for timer in message["timers"]:
+                total = int(timer["remaining"])
+                parts.append(f"[{timer['id']}] {timer['label']} "
+                             f"{total // 3600:02d}:{total % 3600 // 60:02d}:{total % 60:02d}")
+            text = " | ".join(parts) or "(no countdowns)"
+            if text != shown:  # A change also sends a tick, which may repeat the second
+                print(text, flush=True)
+                shown = text
+    finally:
+        writer.close()
+
+
+class DaemonClient:
+    """Follows a daemon's countdowns from a background asyncio thread
+
+    Every tick re-anchors the RemoteClocks; when countdowns are added,
+    changed or cancelled, version moves on and the render loop picks up the
+    new set with timers().
+    """
+
+    CONNECT_TIMEOUT = 2.0
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.clocks = {}  # id -> (RemoteClock, label, target)
+        self.version = 0
+        self.error = None
+        self.connected = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Connect and start following; raises OSError if the daemon cannot be reached"""
+        self.thread = threading.Thread(target=self._run, name="countdown-client", daemon=True)
+        self.thread.start()
+        self.connected.wait(self.CONNECT_TIMEOUT)
+        if self.error is not None or not self.connected.is_set():
+            raise OSError(f"cannot attach to {self.path}: {self.error or 'timed out'}")
+
+    def _run(self):
         try:
-            stdscr.refresh()
-        except curses.error:
-            pass
+            asyncio.run(self._follow())
+        except (OSError, ValueError) as e:
+            self.error = str(e)
+        else:
+            self.error = "the daemon closed the connection"
+        self.connected.set()
 
-        time.sleep(0.05)
+    async def _follow(self):
+        reader, writer = await asyncio.open_unix_connection(self.path)
+        writer.write(b'{"cmd": "subscribe"}\n')
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                message = json.loads(line)
+                if message.get("event") == "tick":
+                    self._update(message["timers"])
+                    self.connected.set()
+        finally:
+            writer.close()
+
+    def _update(self, timers):
+        with self.lock:
+            clocks = self.clocks
+            changed = [(t["id"], t["label"], t["target"]) for t in timers] != \
+                      [(timer_id, label, target) for timer_id, (_, label, target) in clocks.items()]
+            if changed:
+                self.clocks = {t["id"]: (RemoteClock(t["remaining"]), t["label"], t["target"]) for t in timers}
+                self.version += 1
+            else:
+                for timer in timers:
+                    clocks[timer["id"]][0].update(timer["remaining"])
+
+    def timers(self):
+        """(version, [(clock, label), ...]) for the current countdowns"""
+        with self.lock:
+            return self.version, [(clock, label) for clock, label, _ in self.clocks.values()]
 
 
 class ColorTheme:
     """Color theme configuration"""
 
     def __init__(self, name, primary, secondary, accent1, accent2, urgent, scanline=None,
-                 background=curses.COLOR_BLACK):
+                 background=COLOR_BLACK, rgb=None):
         self.name = name
         self.primary = primary  # Main countdown color
         self.secondary = secondary  # Matrix rain color
@@ -602,64 +3354,403 @@ class ColorTheme:
         self.urgent = urgent  # Urgent/glitch color
         self.scanline = scanline or primary  # Scanline color (defaults to primary)
         self.background = background
+        # Role -> (r, g, b) for terminals with 256 or more colors; gradient themes
+        # set it and fall back to the basic colors above elsewhere
+        self.rgb = dict(rgb, head=rgb.get("head", (255, 255, 255))) if rgb else None
+
+    def basic(self, role):
+        """The 8-color palette index for a role; the rain head is always white"""
+        return COLOR_WHITE if role == "head" else getattr(self, role)
 
 
 def get_color_themes():
     """Define available color themes"""
     themes = {
-        'matrix': ColorTheme('Matrix Green', curses.COLOR_GREEN, curses.COLOR_GREEN,
-                             curses.COLOR_YELLOW, curses.COLOR_WHITE, curses.COLOR_RED,
-                             scanline=curses.COLOR_GREEN),
-        'retro': ColorTheme('Retro Amber', curses.COLOR_YELLOW, curses.COLOR_YELLOW,
-                            curses.COLOR_RED, curses.COLOR_WHITE, curses.COLOR_RED,
-                            scanline=curses.COLOR_YELLOW),
-        'scifi': ColorTheme('Sci-Fi Blue', curses.COLOR_CYAN, curses.COLOR_BLUE,
-                            curses.COLOR_WHITE, curses.COLOR_MAGENTA, curses.COLOR_RED,
-                            scanline=curses.COLOR_CYAN),
-        'urgent': ColorTheme('Urgent Red', curses.COLOR_RED, curses.COLOR_RED,
-                             curses.COLOR_YELLOW, curses.COLOR_WHITE, curses.COLOR_RED,
-                             scanline=curses.COLOR_RED),
-        'cyberpunk': ColorTheme('Cyberpunk Purple', curses.COLOR_MAGENTA, curses.COLOR_CYAN,
-                                curses.COLOR_YELLOW, curses.COLOR_RED, curses.COLOR_RED,
-                                scanline=curses.COLOR_MAGENTA),
-        'terminal': ColorTheme('Classic Terminal', curses.COLOR_WHITE, curses.COLOR_GREEN,
-                               curses.COLOR_CYAN, curses.COLOR_YELLOW, curses.COLOR_RED,
-                               scanline=curses.COLOR_WHITE)
+        'matrix': ColorTheme('Matrix Green', COLOR_GREEN, COLOR_GREEN,
+                             COLOR_YELLOW, COLOR_WHITE, COLOR_RED,
+                             scanline=COLOR_GREEN),
+        'retro': ColorTheme('Retro Amber', COLOR_YELLOW, COLOR_YELLOW,
+                            COLOR_RED, COLOR_WHITE, COLOR_RED,
+                            scanline=COLOR_YELLOW),
+        'scifi': ColorTheme('Sci-Fi Blue', COLOR_CYAN, COLOR_BLUE,
+                            COLOR_WHITE, COLOR_MAGENTA, COLOR_RED,
+                            scanline=COLOR_CYAN),
+        'urgent': ColorTheme('Urgent Red', COLOR_RED, COLOR_RED,
+                             COLOR_YELLOW, COLOR_WHITE, COLOR_RED,
+                             scanline=COLOR_RED),
+        'cyberpunk': ColorTheme('Cyberpunk Purple', COLOR_MAGENTA, COLOR_CYAN,
+                                COLOR_YELLOW, COLOR_RED, COLOR_RED,
+                                scanline=COLOR_MAGENTA),
+        'terminal': ColorTheme('Classic Terminal', COLOR_WHITE, COLOR_GREEN,
+                               COLOR_CYAN, COLOR_YELLOW, COLOR_RED,
+                               scanline=COLOR_WHITE),
+        # Gradient themes: smooth fades on 256-color and truecolor terminals
+        'synthwave': ColorTheme('Synthwave Sunset', COLOR_MAGENTA, COLOR_MAGENTA,
+                                COLOR_YELLOW, COLOR_CYAN, COLOR_RED,
+                                rgb={"primary": (255, 79, 216), "secondary": (185, 70, 255),
+                                     "accent1": (255, 200, 87), "accent2": (54, 228, 255),
+                                     "urgent": (255, 56, 100), "background": (20, 8, 38)}),
+        'ocean': ColorTheme('Deep Ocean', COLOR_CYAN, COLOR_BLUE,
+                            COLOR_WHITE, COLOR_CYAN, COLOR_RED,
+                            rgb={"primary": (120, 230, 255), "secondary": (0, 140, 255),
+                                 "accent1": (200, 250, 255), "accent2": (0, 255, 200),
+                                 "urgent": (255, 90, 90), "background": (0, 12, 30)}),
+        'ember': ColorTheme('Ember Glow', COLOR_YELLOW, COLOR_RED,
+                            COLOR_YELLOW, COLOR_WHITE, COLOR_RED,
+                            rgb={"primary": (255, 190, 60), "secondary": (255, 90, 20),
+                                 "accent1": (255, 230, 120), "accent2": (255, 255, 230),
+                                 "urgent": (255, 40, 40), "background": (18, 6, 2)}),
     }
     return themes
 
 
+def print_usage():
+    script_name = sys.argv[0]
+    print(f"Usage: python {script_name} TIME [theme] [options]")
+    print(f"Example: python {script_name} 22:00")
+    print(f"Example: python {script_name} 22:00 retro")
+    print(f"Example: python {script_name} 09:30,12:00,17:45   (dashboard of several timers)")
+    print("TIME is HH:MM or HH:MM:SS, a duration (+90s, 1h30m) or an ISO date and time with optional offset")
+    print("\nAvailable themes:")
+    themes = get_color_themes()
+    for theme_name, theme in themes.items():
+        print(f"  {theme_name} - {theme.name}")
+    print("\nOptions:")
+    print("  --reprobe   Ignore the cached glyph probe results and probe the terminal again")
+    print("  --trail N   Draw rain as trails N glyphs long, with per-column speeds (default 1)")
+    print("  --max-particles N   Cap on live spark/glitch particles (default 256)")
+    print("  --fps N     Target frame rate (default 20)")
+    print("  --low-power Drop to 2 FPS while effects are off or the terminal is unfocused")
+    print("  --no-effects        Show only the timer, without rain or particles")
+    print("  --frame-stats       Print frame-time statistics on exit")
+    print("  --profile   Show the per-phase timing HUD (toggle with 'p')")
+    print("  --profile-log FILE  Append per-second JSON-lines timing records to FILE")
+    print("  --targets-file FILE Add dashboard timers from FILE, one 'TIME [label]' per line")
+    print("  --schedule FILE     Count down to each deadline in FILE in turn, one 'TIME [REPEAT] [label]'")
+    print("                      per line; REPEAT is daily, weekdays, weekends, mon,wed,... or 'every 2h'")
+    print("  --threaded  Step rain and particles on a separate thread from terminal output")
+    print("  --seed N    Seed the effects' random numbers for reproducible runs")
+    print("  --no-banner Start drawing immediately, without the 2 second target banner")
+    print("  --max-bps N Keep terminal output under N bits/s by thinning rain, particles, then FPS")
+    print("  --big       Draw the countdown in large digits")
+    print("  --big-style STYLE   Large digit style: auto (default), block, braille or ascii; implies --big")
+    print("  --backend B Output through curses (default) or ansi, a direct escape-sequence writer (Unix only)")
+    print("  --record FILE       Record what is drawn to FILE for --replay")
+    print(f"Replay:  python {script_name} --replay FILE [--speed X] [--export-cast OUT.cast]")
+    print("  --replay FILE       Play a recording back without running the simulation ('q' stops)")
+    print("  --speed X   Replay speed factor (default 1)")
+    print("  --export-cast OUT   Write the recording as an asciicast v2 file instead of playing it")
+    print(f"Daemon:  python {script_name} --daemon [HH:MM,...]  |  --attach [theme] [--plain]  |  --ctl CMD")
+    print("  --daemon    Own the countdowns and serve them to attached clients")
+    print("  --attach    Show the daemon's countdowns; --plain prints a text line per second")
+    print("  --ctl CMD   Send 'add TIME [LABEL]', 'change ID TIME [LABEL]', 'cancel ID' or 'list'")
+    print("  --socket PATH       Daemon socket (default $XDG_RUNTIME_DIR/retro_countdown.sock)")
+
+
+# Relative durations: "+90s", "1h30m", "+2h"; a bare "+N" counts seconds
+DURATION_RE = re.compile(r"^\+?(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?$")
+CLOCK_RE = re.compile(r"^(\d{1,2}):(\d{2})(?::(\d{2}))?$")
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+
+def parse_duration(text):
+    """Turn "+90s", "1h30m" or "+90" into a timedelta; None if text is not a duration"""
+    if text.startswith("+") and text[1:].isdigit():
+        return timedelta(seconds=int(text[1:]))
+    match = DURATION_RE.match(text)
+    if not match or not any(match.groups()):
+        return None
+    hours, minutes, seconds = (int(group or 0) for group in match.groups())
+    return timedelta(hours=hours, minutes=minutes, seconds=seconds)
+
+
+def parse_target(time_str, now=None, allow_past=False):
+    """Turn a target spec into a datetime; raises ValueError
+
+    Accepts HH:MM or HH:MM:SS (24-hour, the next time the clock shows it, so
+    possibly tomorrow), a duration from now ("+90s", "1h30m") or an ISO 8601
+    date and time, optionally with a UTC offset ("2026-12-31T23:59:59+01:00",
+    "...Z"). Naive times are local. An ISO time that has gone by is an error
+    unless allow_past is set, e.g. for the anchor of a recurring deadline.
+    """
+    now = now or datetime.now()
+    duration = parse_duration(time_str)
+    if duration is not None:
+        return now + duration
+
+    match = CLOCK_RE.match(time_str)
+    if match:
+        hour, minute, second = (int(group or 0) for group in match.groups())
+        if not (0 <= hour <= 23 and 0 <= minute <= 59 and 0 <= second <= 59):
+            raise ValueError(f"invalid time of day {time_str!r}")
+        target = now.replace(hour=hour, minute=minute, second=second, microsecond=0)
+        if target <= now:
+            target += timedelta(days=1)
+        return target
+
+    try:
+        target = datetime.fromisoformat(time_str[:-1] + "+00:00" if time_str.endswith("Z") else time_str)
+    except ValueError:
+        raise ValueError(f"cannot read {time_str!r} as HH:MM[:SS], a duration like +90s or 1h30m, "
+                         f"or an ISO date and time") from None
+    if target.timestamp() <= now.timestamp() and not allow_past:
+        raise ValueError(f"{time_str} is in the past")
+    return target
+
+
+class Recurrence:
+    """When a schedule entry repeats: on a set of weekdays, or at a fixed interval"""
+
+    def __init__(self, days=None, interval=None):
+        self.days = days  # Set of weekday numbers, Monday = 0
+        self.interval = interval  # timedelta
+
+    @classmethod
+    def parse(cls, words):
+        """Read a repeat rule from the start of words; returns (rule or None, words left)"""
+        if not words:
+            return None, words
+        word = words[0].lower()
+        if word == "daily":
+            return cls(days=set(range(7))), words[1:]
+        if word == "weekdays":
+            return cls(days=set(range(5))), words[1:]
+        if word == "weekends":
+            return cls(days={5, 6}), words[1:]
+        if word == "every" and len(words) > 1:
+            interval = parse_duration(words[1])
+            if interval is None or not interval:
+                raise ValueError(f"bad repeat interval {words[1]!r}")
+            return cls(interval=interval), words[2:]
+        names = word.split(",")
+        if all(name in WEEKDAYS for name in names):
+            return cls(days={WEEKDAYS.index(name) for name in names}), words[1:]
+        return None, words
+
+    def first(self, when):
+        """The first occurrence at or after when"""
+        if self.days is not None:
+            while when.weekday() not in self.days:
+                when += timedelta(days=1)
+        return when
+
+    def next(self, when):
+        """The occurrence after when"""
+        if self.interval is not None:
+            return when + self.interval
+        return self.first(when + timedelta(days=1))
+
+    def following(self, when, timestamp):
+        """The first occurrence after when that is also later than timestamp"""
+        behind = timestamp - when.timestamp()
+        if behind > 0:
+            # Catch up on whole periods at once, not one missed occurrence at a time
+            period = self.interval or timedelta(days=1)
+            when += period * int(behind // period.total_seconds())
+        when = self.next(when)
+        while when.timestamp() <= timestamp:
+            when = self.next(when)
+        return when
+
+
+class Schedule:
+    """Deadlines in a heap ordered by time, so the next one is found in O(log n)
+
+    A recurring entry stays in the heap as its next occurrence only; popping
+    it pushes the one after, so thousands of repeating deadlines cost no more
+    memory than thousands of one-off ones.
+    """
+
+    def __init__(self):
+        self.heap = []  # (timestamp, sequence, when, label, recurrence)
+        self.sequence = 0  # Ties pop in insertion order and never compare the rest
+
+    def __len__(self):
+        return len(self.heap)
+
+    def add(self, when, label="", recurrence=None):
+        if recurrence is not None:
+            when = recurrence.first(when)
+        heapq.heappush(self.heap, (when.timestamp(), self.sequence, when, label, recurrence))
+        self.sequence += 1
+
+    def next_after(self, timestamp):
+        """Pop the first deadline later than timestamp as (when, label); None when none are left
+
+        Deadlines that have already passed are dropped on the way, and
+        recurring ones rescheduled past timestamp.
+        """
+        heap = self.heap
+        while heap:
+            due, _, when, label, recurrence = heapq.heappop(heap)
+            if recurrence is not None:
+                self.add(recurrence.following(when, timestamp), label, recurrence)
+            if due > timestamp:
+                return when, label
+        return None
+
+
+def load_schedule(path, now=None):
+    """Read a schedule file into a Schedule, one "WHEN [REPEAT] [LABEL]" per line
+
+    WHEN is any target spec; REPEAT is daily, weekdays, weekends, a day list
+    such as mon,wed,fri, or "every" and a duration. # starts a comment.
+    Durations and times of day are resolved once, against now. A repeating
+    entry may start in the past; it is rolled forward to its next occurrence.
+    """
+    now = now or datetime.now()
+    schedule = Schedule()
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            words = line.split("#", 1)[0].split()
+            if not words:
+                continue
+            try:
+                recurrence, words_left = Recurrence.parse(words[1:])
+                when = parse_target(words[0], now, allow_past=recurrence is not None)
+            except ValueError as e:
+                raise ValueError(f"{path}, line {number}: {e}") from None
+            if recurrence is not None and when.timestamp() <= now.timestamp():
+                when = recurrence.following(when, now.timestamp())
+            schedule.add(when, " ".join(words_left) or words[0], recurrence)
+    return schedule
+
+
+def load_targets_file(path):
+    """Read dashboard targets, one "WHEN [label]" per line; # starts a comment"""
+    targets = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            time_str, _, label = line.partition(" ")
+            targets.append((parse_target(time_str), label.strip() or time_str))
+    return targets
+
+
 def parse_args():
-    """Parse command line arguments for time and optional theme"""
+    """Parse command line arguments for time, optional theme and options"""
     if len(sys.argv) < 2:
-        script_name = sys.argv[0]
-        print(f"Usage: python {script_name} HH:MM [theme]")
-        print(f"Example: python {script_name} 22:00")
-        print(f"Example: python {script_name} 22:00 retro")
-        print("\nAvailable themes:")
-        themes = get_color_themes()
-        for theme_name, theme in themes.items():
-            print(f"  {theme_name} - {theme.name}")
+        print_usage()
         sys.exit(1)
 
-    time_str = sys.argv[1]
-    theme_name = sys.argv[2] if len(sys.argv) > 2 else 'matrix'
-
-    # Parse time
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("time", nargs="?")
+    parser.add_argument("theme", nargs="?", default="matrix")
+    parser.add_argument("--reprobe", action="store_true")
+    parser.add_argument("--trail", type=int, default=1)
+    parser.add_argument("--max-particles", type=int, default=256)
+    parser.add_argument("--fps", type=float, default=20)
+    parser.add_argument("--low-power", action="store_true")
+    parser.add_argument("--no-effects", action="store_true")
+    parser.add_argument("--frame-stats", action="store_true")
+    parser.add_argument("--profile", action="store_true")
+    parser.add_argument("--profile-log")
+    parser.add_argument("--targets-file")
+    parser.add_argument("--schedule")
+    parser.add_argument("--threaded", action="store_true")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--no-banner", action="store_true")
+    parser.add_argument("--max-bps", type=int)
+    # A separate option for the style, so "--big 22:00" cannot take the time for one
+    parser.add_argument("--big", action="store_true")
+    parser.add_argument("--big-style", choices=("auto",) + DigitAtlas.STYLES)
+    parser.add_argument("--backend", choices=("curses", "ansi"), default="curses")
+    parser.add_argument("--record")
+    parser.add_argument("--replay")
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--export-cast")
+    parser.add_argument("--daemon", action="store_true")
+    parser.add_argument("--attach", action="store_true")
+    parser.add_argument("--plain", action="store_true")
+    parser.add_argument("--ctl", nargs="+")
+    parser.add_argument("--socket")
+    parser.add_argument("-h", "--help", action="store_true")
     try:
-        hour, minute = map(int, time_str.split(':'))
-        if not (0 <= hour <= 23 and 0 <= minute <= 59):
-            raise ValueError("Invalid time format")
-
-        now = datetime.now()
-        target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-        if target <= now:
-            target += timedelta(days=1)
+        args = parser.parse_args()
+    except SystemExit:
+        print_usage()
+        sys.exit(1)
+    # The daemon may start empty; clients and --ctl get their countdowns from it
+    remote = args.daemon or args.attach or args.ctl
+    if args.help or (args.time is None and args.targets_file is None and args.schedule is None
+                     and args.replay is None and not remote):
+        print_usage()
+        sys.exit(0 if args.help else 1)
+    args.socket = args.socket or default_socket_path()
+    if args.export_cast and not args.replay:
+        print("Error: --export-cast needs --replay FILE")
+        sys.exit(1)
+    if args.speed <= 0:
+        print("Error: --speed must be positive")
+        sys.exit(1)
+    if args.replay:
+        # The recording knows its own theme and geometry
+        return [], None, args
+
+    theme_name = args.theme
+    if (args.targets_file or args.schedule or remote) and args.time and args.time in get_color_themes():
+        theme_name = args.time  # Only a theme was given, no times
+        args.time = None
+    if args.attach or args.ctl:
+        args.time = args.targets_file = None  # The daemon owns the countdowns
+    if args.schedule and (args.targets_file or remote):
+        print("Error: --schedule cannot be combined with --targets-file or the daemon")
+        sys.exit(1)
 
-    except (ValueError, IndexError):
-        print("Error: Please provide time in HH:MM format (24-hour)")
+    # Parse times; a comma-separated list or a targets file opens the dashboard
+    targets = []
+    try:
+        if args.time:
+            time_strs = args.time.split(",")
+            for time_str in time_strs:
+                targets.append((parse_target(time_str), time_str if len(time_strs) > 1 else ""))
+        if args.targets_file:
+            targets += load_targets_file(args.targets_file)
+        if args.schedule:
+            # One countdown at a time: times given on the command line join the
+            # schedule as one-off deadlines, and the first one due starts now
+            schedule = load_schedule(args.schedule)
+            for target, label in targets:
+                schedule.add(target, label)
+            args.schedule = schedule
+            upcoming = schedule.next_after(time.time())
+            targets = [upcoming] if upcoming is not None else []
+    except (ValueError, IndexError) as e:
+        print(f"Error: {e}")
+        print("Times can be HH:MM or HH:MM:SS (24-hour), a duration such as +90s or 1h30m,")
+        print("or an ISO date and time such as 2026-12-31T23:59:59+01:00")
         print("Example: python retro_countdown.py 22:00")
         sys.exit(1)
+    except OSError as e:
+        print(f"Error: Cannot read targets file: {e}")
+        sys.exit(1)
+    if args.schedule and not targets:
+        print("Error: Every deadline in the schedule has passed")
+        sys.exit(1)
+    if not targets and not remote:
+        print("Error: No countdown targets given")
+        sys.exit(1)
+    if len(targets) > 1:
+        targets = [(target, label or target.strftime("%H:%M")) for target, label in targets]
+
+    if args.trail < 1:
+        print("Error: --trail must be at least 1")
+        sys.exit(1)
+    if args.max_particles < 0:
+        print("Error: --max-particles cannot be negative")
+        sys.exit(1)
+    if args.fps <= 0:
+        print("Error: --fps must be positive")
+        sys.exit(1)
+    if args.max_bps is not None and args.max_bps <= 0:
+        print("Error: --max-bps must be positive")
+        sys.exit(1)
+    if args.backend == "ansi" and termios is None:
+        print("Error: --backend ansi needs a Unix terminal (termios); use the default curses backend")
+        sys.exit(1)
+    args.big = args.big_style or ("auto" if args.big else None)
 
     # Validate theme
     themes = get_color_themes()
@@ -667,29 +3758,91 @@ def parse_args():
         print(f"Error: Unknown theme '{theme_name}'")
         print("Available themes:", ", ".join(themes.keys()))
         sys.exit(1)
+    args.theme = theme_name
 
-    return target, themes[theme_name]
+    return targets, themes[theme_name], args
 
 
 def main():
+    scheduler = options = None
     try:
         # Parse command line arguments
-        target, theme = parse_args()
-
-        print(f"Countdown target: {target.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Theme: {theme.name}")
-        print("Press Ctrl+C to exit")
-        time.sleep(2)  # Give user time to read
+        targets, theme, options = parse_args()
+        wrapper = ansi_wrapper if options.backend == "ansi" else curses.wrapper
 
-        curses.wrapper(countdown_matrix, target, theme)
+        if options.ctl:
+            try:
+                request = ctl_request(options.ctl)
+            except ValueError as e:
+                print(f"Error: {e}")
+                print(f"Example: python {sys.argv[0]} --ctl add 17:45 Release freeze")
+                sys.exit(1)
+            print(json.dumps(asyncio.run(send_command(options.socket, request))))
+            return
+        if options.daemon:
+            daemon = CountdownDaemon(options.socket)
+            for target, label in targets:
+                daemon.add(target, label)
+            print(f"Countdown daemon listening on {options.socket} (Ctrl+C stops it)")
+            asyncio.run(daemon.run())
+            return
+        if options.attach and options.plain:
+            asyncio.run(attach_plain(options.socket))
+            return
+
+        if options.replay:
+            with SessionReader(options.replay) as reader:
+                themes = get_color_themes()
+                theme = themes.get(reader.header.get("theme"), themes["matrix"])
+                if options.export_cast:
+                    events = export_asciicast(reader, theme, options.export_cast)
+                    print(f"Wrote {events} events to {options.export_cast}")
+                else:
+                    wrapper(replay_session, reader, theme, options.speed)
+            return
+
+        client = None
+        if options.attach:
+            client = DaemonClient(options.socket)
+            client.start()
+        elif not options.no_banner:
+            for target, label in targets:
+                print(f"Countdown target: {target.strftime('%Y-%m-%d %H:%M:%S')}" + (f" ({label})" if label else ""))
+            print(f"Theme: {theme.name}")
+            print("Press Ctrl+C to exit")
+            time.sleep(2)  # Give user time to read
+
+        scheduler = FrameScheduler(options.fps, options.low_power)
+        profiler = None
+        if options.profile or options.profile_log:
+            profiler = FrameProfiler(options.profile_log, hud_visible=options.profile)
+
+        governor = BandwidthGovernor(options.max_bps) if options.max_bps else None
+
+        recorder = SessionRecorder(options.record, options.theme) if options.record else None
+        try:
+            wrapper(countdown_matrix, targets, theme, options.reprobe, options.trail,
+                    options.max_particles, scheduler, not options.no_effects, profiler,
+                    options.threaded, options.seed, governor, options.big, recorder, client,
+                    options.schedule)
+        finally:
+            if recorder is not None:
+                recorder.close()
 
     except KeyboardInterrupt:
         print("\nCountdown interrupted by user")
+    except OSError as e:
+        print(f"Error: {e}")  # Daemon socket and file problems, not missing packages
+    except ValueError as e:
+        print(f"Error: {e}")  # Unreadable recordings or daemon replies
     except Exception as e:
         print(f"Error: {e}")
         print("Make sure you have the required packages installed:")
         print("  pip install wcwidth")
         print("  pip install windows-curses  # On Windows only")
+    finally:
+        if scheduler is not None and options.frame_stats:
+            print(f"Frame stats: {scheduler.stats.summary()}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+import asyncio
+import os
+from datetime import datetime
+
+import pytest
+
+import retro_countdown as rc
+
+
+def run_against_daemon(path, requests):
+    """Start a daemon on path, send each request in turn and return the replies"""
+
+    async def session():
+        daemon = rc.CountdownDaemon(path)
+        server = asyncio.ensure_future(daemon.run())
+        while not os.path.exists(path):
+            await asyncio.sleep(0.01)
+        try:
+            return [await rc.send_command(path, request) for request in requests]
+        finally:
+            server.cancel()
+            await asyncio.gather(server, return_exceptions=True)
+
+    return asyncio.run(session())
+
+
+def test_add_list_cancel_round_trip(tmp_path):
+    path = str(tmp_path / "countdown.sock")
+    added, other, listed, cancelled, after, missing = run_against_daemon(path, [
+        rc.ctl_request(["add", "+1h", "Release", "freeze"]),
+        {"cmd": "add", "target": "+2h"},
+        {"cmd": "list"},
+        rc.ctl_request(["cancel", "1"]),
+        {"cmd": "list"},
+        {"cmd": "cancel", "id": 1},
+    ])
+
+    assert added == {"ok": True, "id": 1}
+    assert other == {"ok": True, "id": 2}
+    assert listed["ok"]
+    first, second = listed["timers"]
+    assert (first["id"], first["label"]) == (1, "Release freeze")
+    assert 3590 < first["remaining"] <= 3600
+    # Without a label a countdown is named after its target time
+    assert second["label"] == datetime.fromisoformat(second["target"]).strftime("%H:%M")
+    assert cancelled == {"ok": True, "id": 1}
+    assert [timer["id"] for timer in after["timers"]] == [2]
+    assert missing == {"ok": False, "error": "no countdown with id 1"}
+    assert not os.path.exists(path)  # The socket goes away with the daemon
+
+
+def test_bad_requests_get_errors(tmp_path):
+    path = str(tmp_path / "countdown.sock")
+    bad_time, unknown = run_against_daemon(path, [
+        {"cmd": "add", "target": "25:00"},
+        {"cmd": "frobnicate"},
+    ])
+    assert not bad_time["ok"] and "25:00" in bad_time["error"]
+    assert not unknown["ok"]
+
+
+def test_ctl_usage_errors():
+    for words in (["bogus"], ["add"], ["cancel", "x"], ["change", "1"], ["list", "extra"]):
+        with pytest.raises(ValueError, match="--ctl takes"):
+            rc.ctl_request(words)
@@ -0,0 +1,103 @@
+import time
+from datetime import datetime, timedelta
+
+import retro_countdown as rc
+
+
+def make_scene(height, width, seed, trail_length=8):
+    screen = rc.MemoryScreen(height, width, 256)
+    clock = rc.CountdownClock(datetime.now() + timedelta(hours=1, minutes=20))
+    scene = rc.MatrixCountdown(screen, [clock], rc.get_color_themes()["matrix"], rc.probe_glyph_groups(None),
+                               trail_length=trail_length, seed=seed)
+    return screen, scene
+
+
+def timer_text(screen, scene):
+    timer = scene.timers[0]
+    return screen.lines()[timer.clock_y][timer.time_x:timer.time_x + 8]
+
+
+def test_resize_keeps_timer_digits():
+    # Trail cells remapped under the timer used to be cleared as they aged
+    # out, blanking digits that were not redrawn until their value changed
+    for seed in range(10):
+        screen, scene = make_scene(40, 120, seed)
+        for frame in range(300):
+            if frame == 60:
+                screen.resize(30, 90)
+                scene.resize(30, 90)
+            scene.render_frame(frame / 20)
+        assert timer_text(screen, scene) == scene.timers[0].time_part, f"seed {seed}"
+
+
+def test_threaded_resize_keeps_timer_digits():
+    # Cells released by the new layout must not reach the screen after the timer
+    for seed in range(10):
+        screen, scene = make_scene(40, 120, seed)
+        scene.start_simulation(rc.FrameScheduler(200))
+        try:
+            now = time.monotonic()
+            for frame in range(40):
+                if frame == 20:
+                    screen.resize(30, 90)
+                    scene.resize(30, 90)
+                scene.render_frame(now + frame / 20)
+                time.sleep(0.005)
+        finally:
+            scene.stop_simulation()
+        assert timer_text(screen, scene) == scene.timers[0].time_part, f"seed {seed}"
+
+
+def owned_cells(scene):
+    """Every frame buffer position something in the scene is responsible for clearing"""
+    owned = {pos for pos in scene.trails.positions if pos is not None}
+    owned.update(scene.particles.cell[i] for i in range(scene.particles.count) if scene.particles.cell[i] >= 0)
+    owned.update(scene.hud_cells)
+    for timer in scene.timers:
+        owned.update(timer.cells)
+        owned.update(timer.label_cells)
+    return owned
+
+
+def test_threaded_resize_leaves_no_orphaned_cells():
+    screen, scene = make_scene(40, 120, seed=1)
+    scene.start_simulation(rc.FrameScheduler(200))
+
+    # Widen the window between a simulation step and its publication
+    publish = scene.handoff.publish
+
+    def slow_publish(changes):
+        time.sleep(0.002)
+        publish(changes)
+
+    scene.handoff.publish = slow_publish
+    try:
+        now = time.monotonic()
+        for frame in range(200):
+            if frame % 20 == 19:
+                height, width = (30, 90) if scene.width == 120 else (40, 120)
+                screen.resize(height, width)
+                scene.resize(height, width)
+            scene.render_frame(now + frame / 20)
+            time.sleep(0.001)
+    finally:
+        scene.stop_simulation()
+
+    frame_buffer = scene.frame_buffer
+    assert all(pos < scene.height * scene.width for pos in frame_buffer.cells)
+    assert set(frame_buffer.cells) <= owned_cells(scene)
+
+
+def test_narrow_terminals():
+    # The rain keeps at least two columns, which a 1-column pane cannot show
+    for height, width in ((20, 1), (1, 1), (2, 2), (20, 3)):
+        screen, scene = make_scene(height, width, seed=0)
+        for frame in range(100):
+            scene.render_frame(frame / 20)
+        screen.resize(40, 120)
+        scene.resize(40, 120)
+        screen.resize(height, width)
+        scene.resize(height, width)
+        for frame in range(100, 200):
+            scene.render_frame(frame / 20)
+        assert all(pos < height * width for pos in scene.frame_buffer.cells)
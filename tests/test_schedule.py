@@ -0,0 +1,151 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import retro_countdown as rc
+
+NOW = datetime(2026, 10, 17, 12, 0, 0)  # A Saturday
+
+
+def test_parse_duration():
+    assert rc.parse_duration("+90s") == timedelta(seconds=90)
+    assert rc.parse_duration("+90") == timedelta(seconds=90)
+    assert rc.parse_duration("1h30m") == timedelta(hours=1, minutes=30)
+    assert rc.parse_duration("+2h5s") == timedelta(hours=2, seconds=5)
+    for text in ("", "+", "90", "1x", "h", "12:00"):
+        assert rc.parse_duration(text) is None
+
+
+def test_parse_target_durations():
+    assert rc.parse_target("+90s", NOW) == NOW + timedelta(seconds=90)
+    assert rc.parse_target("1h30m", NOW) == NOW + timedelta(hours=1, minutes=30)
+
+
+def test_parse_target_clock_times():
+    assert rc.parse_target("22:00", NOW) == datetime(2026, 10, 17, 22, 0)
+    assert rc.parse_target("12:00:30", NOW) == datetime(2026, 10, 17, 12, 0, 30)
+    # Times already gone today mean tomorrow, including the current second
+    assert rc.parse_target("09:30", NOW) == datetime(2026, 10, 18, 9, 30)
+    assert rc.parse_target("12:00", NOW) == datetime(2026, 10, 18, 12, 0)
+    for text in ("24:00", "12:60", "12:00:60"):
+        with pytest.raises(ValueError, match="invalid time of day"):
+            rc.parse_target(text, NOW)
+
+
+def test_parse_target_iso():
+    offset = rc.parse_target("2026-12-31T23:59:59+01:00", NOW)
+    assert offset == datetime(2026, 12, 31, 22, 59, 59, tzinfo=timezone.utc)
+    assert rc.parse_target("2026-12-31T23:59:59Z", NOW) == datetime(2026, 12, 31, 23, 59, 59, tzinfo=timezone.utc)
+    assert rc.parse_target("2026-12-31 08:00", NOW) == datetime(2026, 12, 31, 8, 0)
+    with pytest.raises(ValueError, match="in the past"):
+        rc.parse_target("2020-01-01T09:00", NOW)
+    assert rc.parse_target("2020-01-01T09:00", NOW, allow_past=True) == datetime(2020, 1, 1, 9, 0)
+    with pytest.raises(ValueError, match="cannot read"):
+        rc.parse_target("tomorrow", NOW)
+
+
+def test_recurrence_parse():
+    rule, rest = rc.Recurrence.parse(["weekdays", "Stand", "up"])
+    assert rule.days == {0, 1, 2, 3, 4} and rest == ["Stand", "up"]
+    rule, rest = rc.Recurrence.parse(["mon,WED"])
+    assert rule.days == {0, 2} and rest == []
+    rule, rest = rc.Recurrence.parse(["every", "1h30m", "Stretch"])
+    assert rule.interval == timedelta(hours=1, minutes=30) and rest == ["Stretch"]
+    assert rc.Recurrence.parse(["Lunch"]) == (None, ["Lunch"])
+    assert rc.Recurrence.parse([]) == (None, [])
+    with pytest.raises(ValueError, match="bad repeat interval"):
+        rc.Recurrence.parse(["every", "0s"])
+
+
+def test_recurrence_days_and_intervals():
+    weekdays = rc.Recurrence(days=set(range(5)))
+    assert weekdays.first(NOW) == datetime(2026, 10, 19, 12, 0)  # Saturday -> Monday
+    assert weekdays.next(datetime(2026, 10, 23, 9, 0)) == datetime(2026, 10, 26, 9, 0)  # Friday -> Monday
+    every = rc.Recurrence(interval=timedelta(minutes=25))
+    assert every.first(NOW) == NOW
+    assert every.next(NOW) == NOW + timedelta(minutes=25)
+
+
+def test_recurrence_following_skips_missed_occurrences():
+    every = rc.Recurrence(interval=timedelta(minutes=1))
+    anchor = datetime(2020, 1, 1, 0, 0, 30)
+    assert every.following(anchor, NOW.timestamp()) == datetime(2026, 10, 17, 12, 0, 30)
+    daily = rc.Recurrence(days=set(range(7)))
+    assert daily.following(datetime(2020, 1, 1, 9, 0), NOW.timestamp()) == datetime(2026, 10, 18, 9, 0)
+    # An occurrence still ahead just moves on to the next one
+    assert daily.following(datetime(2026, 10, 18, 9, 0), NOW.timestamp()) == datetime(2026, 10, 19, 9, 0)
+
+
+def test_schedule_pops_in_time_order():
+    schedule = rc.Schedule()
+    rng = random.Random(0)
+    offsets = [rng.randint(1, 100000) for _ in range(2000)]
+    for offset in offsets:
+        schedule.add(NOW + timedelta(seconds=offset), str(offset))
+    schedule.add(NOW + timedelta(seconds=50), "first tie")
+    schedule.add(NOW + timedelta(seconds=50), "second tie")
+
+    popped = []
+    timestamp = NOW.timestamp()
+    while len(popped) < len(offsets) + 2:
+        when, label = schedule.next_after(timestamp - 1)  # Equal deadlines are not skipped
+        popped.append((when, label))
+        timestamp = when.timestamp()
+    assert [when for when, _ in popped] == sorted(when for when, _ in popped)
+    ties = [label for _, label in popped if label.endswith("tie")]
+    assert ties == ["first tie", "second tie"]
+    assert schedule.next_after(timestamp) is None
+
+
+def test_schedule_skips_passed_deadlines_and_repeats():
+    schedule = rc.Schedule()
+    schedule.add(NOW - timedelta(minutes=5), "missed")
+    schedule.add(NOW + timedelta(minutes=10), "once")
+    schedule.add(NOW + timedelta(minutes=1), "pomodoro", rc.Recurrence(interval=timedelta(minutes=4)))
+    timestamp = NOW.timestamp()
+    labels = []
+    for _ in range(5):
+        when, label = schedule.next_after(timestamp)
+        labels.append((int((when - NOW).total_seconds() // 60), label))
+        timestamp = when.timestamp()
+    assert labels == [(1, "pomodoro"), (5, "pomodoro"), (9, "pomodoro"), (10, "once"), (13, "pomodoro")]
+    assert len(schedule) == 1  # Only the repeating entry is left
+
+
+def test_load_schedule(tmp_path):
+    path = tmp_path / "schedule.txt"
+    path.write_text("# Team deadlines\n"
+                    "2020-01-01T09:00 daily Standup\n"
+                    "2020-01-06T10:00 mon,wed Review  # past anchors roll forward\n"
+                    "+25m every 30m Pomodoro\n"
+                    "\n"
+                    "2026-12-31T23:59:59\n", encoding="utf-8")
+    schedule = rc.load_schedule(path, NOW)
+    upcoming = []
+    timestamp = NOW.timestamp()
+    for _ in range(5):
+        when, label = schedule.next_after(timestamp)
+        upcoming.append((when, label))
+        timestamp = when.timestamp()
+    assert upcoming == [
+        (datetime(2026, 10, 17, 12, 25), "Pomodoro"),
+        (datetime(2026, 10, 17, 12, 55), "Pomodoro"),
+        (datetime(2026, 10, 17, 13, 25), "Pomodoro"),
+        (datetime(2026, 10, 17, 13, 55), "Pomodoro"),
+        (datetime(2026, 10, 17, 14, 25), "Pomodoro"),
+    ]
+    labels = {entry[3]: entry[2] for entry in schedule.heap}
+    assert labels["Standup"] == datetime(2026, 10, 18, 9, 0)
+    assert labels["Review"] == datetime(2026, 10, 19, 10, 0)
+    assert labels["2026-12-31T23:59:59"] == datetime(2026, 12, 31, 23, 59, 59)
+
+
+def test_load_schedule_errors_name_the_line(tmp_path):
+    path = tmp_path / "schedule.txt"
+    path.write_text("+1h Fine\n2020-01-01T09:00 One-off in the past\n", encoding="utf-8")
+    with pytest.raises(ValueError, match=r"line 2: 2020-01-01T09:00 is in the past"):
+        rc.load_schedule(path, NOW)
+    path.write_text("+1h every never\n", encoding="utf-8")
+    with pytest.raises(ValueError, match=r"line 1: bad repeat interval"):
+        rc.load_schedule(path, NOW)
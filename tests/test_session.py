@@ -0,0 +1,63 @@
+import pytest
+
+import retro_countdown as rc
+
+
+def test_varint_round_trip():
+    for value in (0, 1, 0x7F, 0x80, 300, 2 ** 21, 2 ** 40):
+        out = bytearray()
+        rc.put_varint(out, value)
+        assert rc.get_varint(out, 0) == (value, len(out))
+
+
+def record_session(path):
+    """Record a short session; returns what each record should read back as"""
+    recorder = rc.SessionRecorder(path, "synthwave")
+    recorder.start(24, 80)
+    # Far-apart positions and 200 distinct glyphs need multi-byte gaps and glyph ids
+    first = [(0, "A", rc.STYLE_TIMER), (5, "⣿", rc.STYLE_RAIN_HEAD), (1000, "█", rc.STYLE_COUNT - 1)]
+    many = [(pos * 3, chr(0x2800 + pos), pos % rc.STYLE_COUNT) for pos in range(200)]
+    again = [(7, "A", rc.STYLE_SPARK), (1919, "⣿", rc.STYLE_SPARK_FADE)]
+    recorder.frame(first)
+    recorder.resize(30, 100)
+    recorder.frame(many)
+    recorder.message(12, 40, "TIME'S UP!", rc.STYLE_TIMER)
+    recorder.frame(again)
+    recorder.close()
+    return [(rc.RECORD_FRAME, first), (rc.RECORD_RESIZE, (30, 100)), (rc.RECORD_FRAME, many),
+            (rc.RECORD_MESSAGE, (12, 40, rc.STYLE_TIMER, "TIME'S UP!")), (rc.RECORD_FRAME, again),
+            (rc.RECORD_END, None)]
+
+
+def test_session_round_trip(tmp_path):
+    path = tmp_path / "session.rec"
+    expected = record_session(path)
+    with rc.SessionReader(path) as reader:
+        assert (reader.header["height"], reader.header["width"]) == (24, 80)
+        assert reader.header["theme"] == "synthwave"
+        records = list(reader)
+    assert [(tag, fields) for _, tag, fields in records] == expected
+    times = [seconds for seconds, _, _ in records]
+    assert times == sorted(times)
+
+
+def test_truncated_session_stops_at_last_whole_record(tmp_path):
+    path = tmp_path / "session.rec"
+    expected = record_session(path)
+    data = path.read_bytes()
+    # Cut into the END record, then into the message record
+    for cut, whole in ((len(data) - 1, 5), (len(data) - 25, 3)):
+        path.write_bytes(data[:cut])
+        with rc.SessionReader(path) as reader:
+            assert [(tag, fields) for _, tag, fields in reader] == expected[:whole]
+
+
+def test_reader_rejects_other_files(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_bytes(b"not a recording\n")
+    with pytest.raises(ValueError, match="not a countdown recording"):
+        rc.SessionReader(path)
+
+    path.write_bytes(rc.SESSION_MAGIC + b"\x02{}")
+    with pytest.raises(ValueError, match="damaged header"):
+        rc.SessionReader(path)